@@ -1,13 +1,30 @@
 # L.A.U.R.A. CONTROLLER Ver.3 - ble_handler.py
+import asyncio
+import config
 from logger_utils import print_warning, print_error, print_debug
 from commands import GoProUuid
 
-_callbacks = []  # List of registered coroutine callbacks for BLE event notifications
+_callbacks = ()  # Registered coroutine callbacks for BLE event notifications (replaced, never mutated)
 
-# Stores ResponseAccumulator instances keyed by characteristic UUID,
+# Integer keys for the response characteristics (the "00xx" part of B5F900xx-...).
+# Passing these instead of UUID objects makes per-packet dict lookups cheap int hashes.
+COMMAND_RSP_KEY = 0x0073
+SETTINGS_RSP_KEY = 0x0075
+QUERY_RSP_KEY = 0x0077
+
+# Stores ResponseAccumulator instances keyed by characteristic key (int) or UUID,
 # used to reassemble fragmented BLE packets per characteristic
 response_accumulators = {}
 
+# Response handlers keyed by characteristic key (int) or UUID, filled on first use
+# (integer keys are preloaded at the bottom of the module)
+_handler_cache = {}
+
+# Recycled reassembly buffers, reused across messages to avoid heap churn on MicroPython
+_buffer_pool = []
+MAX_POOL_SIZE = 4      # Maximum number of buffers kept in the pool
+MAX_POOL_BUF = 512     # Buffers larger than this (bytes) are not recycled
+
 # Mapping of generic BLE response result codes to human-readable strings
 RESULT_MESSAGES = {
     0x00: "success",
@@ -34,30 +51,70 @@ SETTINGS_MAPPINGS = {
     0x79: "video_lens",
 }
 
+# Status value type codes, used as indexes into the decoder table
+TYPE_BOOL = 0
+TYPE_INT = 1
+TYPE_STRING = 2
+TYPE_RAW = 3  # Value is passed through as raw bytes
+
 # Defines known status identifiers returned by GoPro query responses,
-# including their human-readable names and expected data types
+# including their human-readable names and expected data types (TYPE_* codes)
 STATUS_DEFINITIONS = {
-    0x01: {"name": "battery_present", "type": "bool"},
-    0x02: {"name": "internal_battery_bars", "type": "int"},
-    0x06: {"name": "system_hot", "type": "bool"},
-    0x0A: {"name": "recording_status", "type": "bool"},
-    0x11: {"name": "wireless_enabled", "type": "bool"},
-    0x1E: {"name": "access_point_ssid", "type": "string"},
-    0x21: {"name": "primary_storage", "type": "int"},
-    0x22: {"name": "wifi_scan_state", "type": "int"},
-    0x23: {"name": "remaining_video_time", "type": "int"},
-    0x27: {"name": "videos", "type": "int"},
-    0x46: {"name": "internal_battery_percentage", "type": "int"},
-    0x55: {"name": "low_temp", "type": "bool"},
-    0x59: {"name": "flatmode", "type": "int"},
-    0x5D: {"name": "video_preset", "type": "int"},
-    0x5E: {"name": "photo_preset", "type": "int"},
-    0x5F: {"name": "timelapse_preset", "type": "int"},
-    0x60: {"name": "preset_group", "type": "int"},
-    0x61: {"name": "preset", "type": "int"},
+    0x01: {"name": "battery_present", "type": TYPE_BOOL},
+    0x02: {"name": "internal_battery_bars", "type": TYPE_INT},
+    0x06: {"name": "system_hot", "type": TYPE_BOOL},
+    0x0A: {"name": "recording_status", "type": TYPE_BOOL},
+    0x11: {"name": "wireless_enabled", "type": TYPE_BOOL},
+    0x1E: {"name": "access_point_ssid", "type": TYPE_STRING},
+    0x21: {"name": "primary_storage", "type": TYPE_INT},
+    0x22: {"name": "wifi_scan_state", "type": TYPE_INT},
+    0x23: {"name": "remaining_video_time", "type": TYPE_INT},
+    0x27: {"name": "videos", "type": TYPE_INT},
+    0x46: {"name": "internal_battery_percentage", "type": TYPE_INT},
+    0x55: {"name": "low_temp", "type": TYPE_BOOL},
+    0x59: {"name": "flatmode", "type": TYPE_INT},
+    0x5D: {"name": "video_preset", "type": TYPE_INT},
+    0x5E: {"name": "photo_preset", "type": TYPE_INT},
+    0x5F: {"name": "timelapse_preset", "type": TYPE_INT},
+    0x60: {"name": "preset_group", "type": TYPE_INT},
+    0x61: {"name": "preset", "type": TYPE_INT},
     # Add additional status definitions here as needed
 }
 
+def _decode_bool(value):
+    """Decode a TLV value as a boolean (any non-zero byte is True)."""
+    return value[0] != 0 if len(value) == 1 else any(value)
+
+def _decode_int(value):
+    """Decode a big-endian TLV value as an unsigned integer."""
+    # Byte math for the common 1/2/4-byte sizes, generic conversion otherwise
+    length = len(value)
+    if length == 1:
+        return value[0]
+    if length == 2:
+        return (value[0] << 8) | value[1]
+    if length == 4:
+        return (value[0] << 24) | (value[1] << 16) | (value[2] << 8) | value[3]
+    return int.from_bytes(value, "big")
+
+def _decode_string(value):
+    """Decode a TLV value as a UTF-8 string, dropping invalid bytes."""
+    return bytes(value).decode("utf-8", errors="ignore")
+
+def _decode_raw(value):
+    """Return the TLV value as raw bytes."""
+    return bytes(value)
+
+# Decoder functions indexed by TYPE_* code
+_DECODERS = (_decode_bool, _decode_int, _decode_string, _decode_raw)
+
+# Per-status (name, decoder) pairs specialized from STATUS_DEFINITIONS at import time,
+# so parsing a status entry is a single lookup followed by a direct decoder call
+_STATUS_PARSERS = {
+    k: (v["name"], _DECODERS[v["type"]])
+    for k, v in STATUS_DEFINITIONS.items()
+}
+
 # Set of (feature_id, action_id) tuples representing protobuf-encoded BLE responses,
 # used to identify which BLE packets should be processed as protobuf data
 PROTOBUF_IDS = {
@@ -73,6 +130,10 @@ PROTOBUF_IDS = {
     (0xF5, 0xF4), (0xF5, 0xF5),
 }
 
+# PROTOBUF_IDS packed as (feature_id << 8) | action_id, so membership checks hash a
+# single int instead of building and hashing a tuple per call
+_PROTOBUF_IDS_PACKED = frozenset((f << 8) | a for f, a in PROTOBUF_IDS)
+
 def is_protobuf_response(feature_id: int, action_id: int) -> bool:
     """
     Check if the given feature and action IDs correspond to a protobuf-encoded response.
@@ -84,7 +145,7 @@ def is_protobuf_response(feature_id: int, action_id: int) -> bool:
     Returns:
         bool: True if the pair matches known protobuf response IDs, False otherwise.
     """
-    return (feature_id, action_id) in PROTOBUF_IDS
+    return ((feature_id << 8) | action_id) in _PROTOBUF_IDS_PACKED
 
 def register_callback(cb):
     """
@@ -95,10 +156,40 @@ def register_callback(cb):
     Args:
         cb (coroutine function): Callback coroutine to register.
     """
-    _callbacks.append(cb)
-    
+    global _callbacks
+    _callbacks = _callbacks + (cb,)  # Copy-on-write, so in-flight dispatches keep their snapshot
+
+async def _notify_callbacks(event_type, payload):
+    """
+    Run all registered callbacks concurrently for a parsed BLE event.
+
+    Errors raised by one callback are logged and do not prevent the others from running.
+
+    Args:
+        event_type (str): Event type passed to each callback.
+        payload (dict): Parsed event data passed to each callback.
+    """
+    callbacks = _callbacks
+    if not callbacks:
+        return
+    results = await asyncio.gather(*(cb(event_type, payload) for cb in callbacks), return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            print_error(f"Callback error: {result}")
+
 # --- TLV Response Reassembly Logic --- #
 
+# Start-packet header layouts indexed by header type (bits 6-5 of the first byte).
+# Each entry is (length mask applied to the first byte, payload start offset, header name);
+# the bytes between the first byte and the payload extend the length, big-endian.
+# Header type 0b11 is reserved and has no entry.
+_HEADER_LAYOUTS = (
+    (0x1F, 1, "5-bit"),   # 0b00: General header with 5-bit length
+    (0x1F, 2, "13-bit"),  # 0b01: Extended 13-bit length
+    (0x00, 3, "16-bit"),  # 0b10: Extended 16-bit length
+    None,                 # 0b11: Reserved
+)
+
 class ResponseAccumulator:
     """
     Accumulates fragmented BLE TLV response packets and reassembles them into full messages.
@@ -107,37 +198,64 @@ class ResponseAccumulator:
     multiple header formats defining payload length.
 
     Attributes:
-        buffer (bytearray): Accumulated payload bytes.
-        expected_length (int or None): Total expected length of the full message.
+        buffer (bytearray or None): Payload buffer, taken from the pool or preallocated to the
+            length announced in the header. May be longer than the payload.
+        mv (memoryview): View over `buffer` used to write payload fragments in place.
+        write_pos (int): Number of payload bytes written into `buffer` so far.
+        expected_length (int or None): Total expected length of the full message;
+            None when no multi-packet message is being received.
         expected_seq (int): Sequence number expected for next continuation packet.
-        receiving (bool): Flag indicating if currently receiving a multi-packet message.
     """
     def __init__(self):
-        self.buffer = bytearray()
-        self.expected_length = None  # Total expected length of the full message payload
+        self.buffer = None           # Reassembly buffer, acquired when a start packet arrives
+        self.mv = None               # memoryview over buffer, set once the header is parsed
+        self.write_pos = 0           # Number of payload bytes written so far
+        self.expected_length = None  # Total expected length of the full message payload (None when idle)
         self.expected_seq = 0        # Expected continuation sequence number (increments with each continuation packet)
-        self.receiving = False       # Are we in the middle of receiving a multi-packet message?
 
     def reset(self):
-        """Reset the accumulator to initial empty state."""
-        self.buffer = bytearray()  # MicroPython-compatible
+        """Reset the accumulator to initial empty state, returning the buffer to the pool."""
+        self._release_buffer()
+        self.write_pos = 0
         self.expected_length = None
         self.expected_seq = 0
-        self.receiving = False
 
-    def is_complete(self):
+    def _acquire_buffer(self, length):
         """
-        Determine if the full message has been accumulated.
+        Take a pooled buffer with at least `length` bytes of capacity, or allocate a new one.
+
+        Args:
+            length (int): Required payload capacity in bytes.
 
         Returns:
-            bool: True if the buffer length is at least the expected payload length.
+            bytearray: A buffer whose length is at least `length`.
         """
-        if self.expected_length is None:
-            return False
+        for i in range(len(_buffer_pool)):
+            if len(_buffer_pool[i]) >= length:
+                return _buffer_pool.pop(i)
+        return bytearray(length)
+
+    def _release_buffer(self):
+        """Hand the current buffer back to the pool if there is room and it is not oversized."""
+        self.mv = None  # Drop the view before the buffer is shared again
+        buf = self.buffer
+        if buf and len(buf) <= MAX_POOL_BUF and len(_buffer_pool) < MAX_POOL_SIZE:
+            _buffer_pool.append(buf)
+        self.buffer = None
+
+    def _finish(self):
+        """
+        Close the current message and return a view of its payload.
 
-        current_length = len(self.buffer)
-        is_full = current_length >= self.expected_length
-        return is_full
+        The receive state is cleared so further continuations are rejected, but the
+        buffer stays owned by this accumulator until `reset()` or the next start packet.
+
+        Returns:
+            memoryview: Zero-copy view of the complete payload, valid until the next `reset()`.
+        """
+        self.expected_length = None
+        self.expected_seq = 0
+        return self.mv[:self.write_pos]
 
     def add(self, data):
         """
@@ -146,59 +264,66 @@ class ResponseAccumulator:
         Args:
             data (bytes or bytearray): Incoming BLE packet to process.
 
+        Returns:
+            memoryview or None: View of the complete payload when this packet finishes
+                the message, otherwise None.
+
         Notes:
             - First byte indicates header type or continuation and sequence number.
             - Resets if sequence numbers mismatch or packet is malformed.
         """
-        print_debug(f"[BLE] Accumulator received packet: {data.hex()}")
+        if config.DEBUG_ENABLED:
+            print_debug(f"[BLE] Accumulator received packet: {data.hex()}")
         
         if not data:
             print_warning("[BLE] Empty packet received, ignoring.")
             return
 
         first_byte = data[0]
-        first_byte_bin = f"{first_byte:08b}"
         is_continuation = (first_byte & 0x80) != 0
         seq_num = first_byte & 0x7F  # Lower 7 bits = sequence number
         
-        print_debug(f"[BLE] First byte: 0x{first_byte:02X} (binary: {first_byte_bin})")
+        if config.DEBUG_ENABLED:
+            print_debug(f"[BLE] First byte: 0x{first_byte:02X} (binary: {first_byte:08b})")
 
         if not is_continuation:
             # New message start packet
-            header_type = (first_byte >> 5) & 0x03
-
-            if header_type == 0b00:  # General header with 5-bit length
-                self.expected_length = first_byte & 0x1F
-                payload_start = 1
-            elif header_type == 0b01:  # Extended 13-bit length
-                if len(data) < 2:
-                    print_warning("[BLE] Packet too short for 13-bit length header, discarding.")
-                    self.reset()
-                    return
-                self.expected_length = ((first_byte & 0x1F) << 8) + data[1]
-                payload_start = 2
-            elif header_type == 0b10:  # Extended 16-bit length
-                if len(data) < 3:
-                    print_warning("[BLE] Packet too short for 16-bit length header, discarding.")
-                    self.reset()
-                    return
-                self.expected_length = (data[1] << 8) + data[2]
-                payload_start = 3
-            else:
+            layout = _HEADER_LAYOUTS[(first_byte >> 5) & 0x03]
+
+            if layout is None:
                 print_error(f"[BLE] Unknown header type in first byte: {first_byte:02x}")
                 self.reset()
                 return
 
-            # Start fresh with new payload
-            self.buffer = bytearray(data[payload_start:])
+            mask, payload_start, header_name = layout
+            if len(data) < payload_start:
+                print_warning(f"[BLE] Packet too short for {header_name} length header, discarding.")
+                self.reset()
+                return
+
+            expected_length = first_byte & mask
+            for i in range(1, payload_start):
+                expected_length = (expected_length << 8) | data[i]
+            self.expected_length = expected_length
+
+            # Start fresh with a buffer sized from the header, so continuations are written in place
+            self._release_buffer()
+            self.buffer = self._acquire_buffer(self.expected_length)
+            self.mv = memoryview(self.buffer)
+            n = min(len(data) - payload_start, self.expected_length)
+            self.mv[0:n] = data[payload_start:payload_start + n]
+            self.write_pos = n
             self.expected_seq = 0  # Expect next continuation packet to have seq=0
-            self.receiving = True
             
-            print_debug(f"[BLE] Accumulator buffer length: {len(self.buffer)} / expected {self.expected_length}")
+            if config.DEBUG_ENABLED:
+                print_debug(f"[BLE] Accumulator buffer length: {self.write_pos} / expected {self.expected_length}")
+
+            if self.write_pos >= self.expected_length:
+                return self._finish()
 
         else:
             # Continuation packet - verify sequence number
-            if not self.receiving:
+            if self.expected_length is None:
                 # We got a continuation packet without starting a new message - discard
                 print_warning(f"[BLE] Unexpected continuation packet seq={seq_num} without active message. Discarding.")
                 self.reset()
@@ -210,11 +335,33 @@ class ResponseAccumulator:
                 self.reset()
                 return
 
-            # Append payload (skip first byte)
-            self.buffer.extend(data[1:])
+            # Write payload (skip first byte) at the current offset, ignoring any bytes past the expected length
+            n = min(len(data) - 1, self.expected_length - self.write_pos)
+            self.mv[self.write_pos:self.write_pos + n] = data[1:1 + n]
+            self.write_pos += n
             self.expected_seq += 1
             
-            print_debug(f"[BLE] Accumulator buffer length: {len(self.buffer)} / expected {self.expected_length}")
+            if config.DEBUG_ENABLED:
+                print_debug(f"[BLE] Accumulator buffer length: {self.write_pos} / expected {self.expected_length}")
+
+            if self.write_pos >= self.expected_length:
+                return self._finish()
+
+def normalize_uuid(uuid):
+    """
+    Convert a characteristic UUID to the lowercase string form used for dispatch.
+
+    Args:
+        uuid (UUID or str): BLE characteristic UUID.
+
+    Returns:
+        str: The UUID string without the "UUID('...')" wrapper, in lowercase.
+    """
+    # strip "UUID('" from start and "')" from end
+    uuid_str = str(uuid)
+    if uuid_str[:6] == "UUID('" and uuid_str[-2:] == "')":
+        uuid_str = uuid_str[6:-2]
+    return uuid_str.lower()
 
 def get_accumulator(uuid):
     """
@@ -230,48 +377,63 @@ def get_accumulator(uuid):
         response_accumulators[uuid] = ResponseAccumulator()
     return response_accumulators[uuid]
 
-async def handle_ble_notification(char_uuid, data):
+def accumulate_notification(char_uuid, data):
     """
-    Handle incoming BLE notifications, performing packet reassembly and dispatch.
+    Feed a BLE notification packet into the accumulator for its characteristic.
+
+    This is synchronous so a burst of fragments can be consumed without yielding
+    to the event loop; only complete messages need to be dispatched.
 
     Args:
         char_uuid (UUID): UUID of the characteristic that generated the notification.
         data (bytes): The notification payload.
 
-    Behavior:
-        - Uses ResponseAccumulator to reassemble fragmented data.
-        - Dispatches complete messages to the appropriate handler based on UUID.
+    Returns:
+        memoryview or None: View of the reassembled message once complete, otherwise None.
+            The view stays valid until `release_response()` is called for the same
+            characteristic.
     """
-    acc = get_accumulator(char_uuid)
-    acc.add(data)
+    # The accumulator keeps its buffer until the message is released
+    return get_accumulator(char_uuid).add(data)
 
-    if not acc.is_complete():
-        # Still waiting for more packets
-        return
+def release_response(char_uuid):
+    """
+    Release the buffer holding the last complete message of a characteristic.
 
-    # Once complete, forward to the appropriate handler and reset accumulator
-    reassembled_data = acc.buffer
-    acc.reset()
+    Call this once the view returned by `accumulate_notification()` has been handled;
+    the buffer goes back to the pool and the view must no longer be used.
 
-    # strip "UUID('" from start and "')" from end
-    uuid_str = str(char_uuid)
-    if uuid_str.startswith("UUID('") and uuid_str.endswith("')"):
-        uuid_str = uuid_str[6:-2]
-    uuid_str = uuid_str.lower()
-
-    # Simple dispatch based on characteristic UUID string (adjust your UUID names accordingly)
-    expected_command_rsp = GoProUuid.COMMAND_RSP_UUID.lower()
-    expected_settings_rsp = GoProUuid.SETTINGS_RSP_UUID.lower()
-    expected_query_rsp = GoProUuid.QUERY_RSP_UUID.lower()
-
-    if uuid_str == expected_command_rsp:
-        await handle_command_response(char_uuid, reassembled_data)
-    elif uuid_str == expected_settings_rsp:
-        await handle_settings_response(char_uuid, reassembled_data)
-    elif uuid_str == expected_query_rsp:
-        await handle_query_response(char_uuid, reassembled_data)
-    else:
-        print_warning(f"[BLE] Unknown UUID received: {char_uuid}")
+    Args:
+        char_uuid (UUID): UUID of the characteristic that generated the message.
+    """
+    get_accumulator(char_uuid).reset()
+
+async def dispatch_response(char_uuid, reassembled_data):
+    """
+    Dispatch a complete, reassembled message to the handler for its characteristic.
+
+    The caller is responsible for keeping `reassembled_data` valid until this returns,
+    i.e. not resetting the accumulator while a view into its buffer is being handled.
+
+    Args:
+        char_uuid (int or UUID): Key (e.g. QUERY_RSP_KEY) or UUID of the characteristic
+            that generated the message.
+        reassembled_data (memoryview or bytes): The complete message payload.
+    """
+    handler = _handler_cache.get(char_uuid)
+    if handler is None:
+        # Dispatch based on the normalized characteristic UUID string, then remember the result
+        handler = _UUID_DISPATCH.get(normalize_uuid(char_uuid))
+        if handler is None:
+            # Warn once per UUID; later messages from it are dropped silently
+            print_warning(f"[BLE] Unknown UUID received: {char_uuid}")
+            handler = _ignore_response
+        _handler_cache[char_uuid] = handler
+    await handler(char_uuid, reassembled_data)
+
+async def _ignore_response(char_uuid, data):
+    """Handler for characteristics without a parser: drops the message."""
+    return None
 
 async def handle_command_response(char_uuid, data):
     """
@@ -279,22 +441,24 @@ async def handle_command_response(char_uuid, data):
 
     Args:
         char_uuid (UUID): UUID of the characteristic that sent the response.
-        data (bytes): The command response data payload.
+        data (memoryview or bytes): The command response data payload.
 
     Behavior:
         - Parses command ID and result code.
         - Logs and notifies registered callbacks.
     """
     if len(data) < 2:
-        print_error(f"Incomplete command response: {data.hex()}")
+        print_error(f"Incomplete command response: {bytes(data).hex()}")
         return
 
-    command_id, result_code = data[:2]
+    command_id = data[0]
+    result_code = data[1]
 
     command_name = COMMAND_MAPPINGS.get(command_id, f"Unknown Command ({command_id})")
     result_message = RESULT_MESSAGES.get(result_code, f"Unknown Result ({result_code})")
 
-    print_debug(f"[BLE] Command response: {command_name} → {result_message}")
+    if config.DEBUG_ENABLED:
+        print_debug(f"[BLE] Command response: {command_name} → {result_message}")
     parsed_result = {
         "command_id": command_id,
         "command_name": command_name,
@@ -302,11 +466,7 @@ async def handle_command_response(char_uuid, data):
     }
 
     # Notify registered callbacks
-    for cb in _callbacks:
-        try:
-            await cb("command_response", parsed_result)
-        except Exception as e:
-            print_error(f"Callback error: {e}")
+    await _notify_callbacks("command_response", parsed_result)
 
     return parsed_result
 
@@ -316,22 +476,24 @@ async def handle_settings_response(char_uuid, data):
 
     Args:
         char_uuid (UUID): UUID of the characteristic that sent the response.
-        data (bytes): The settings response data payload.
+        data (memoryview or bytes): The settings response data payload.
 
     Behavior:
         - Parses setting ID and result code.
         - Logs and notifies registered callbacks.
     """
     if len(data) < 2:
-        print_error(f"[BLE] Incomplete settings response: {data.hex()}")
+        print_error(f"[BLE] Incomplete settings response: {bytes(data).hex()}")
         return
 
-    setting_id, result_code = data[:2]
+    setting_id = data[0]
+    result_code = data[1]
 
     setting_name = SETTINGS_MAPPINGS.get(setting_id, f"Unknown Setting ({setting_id})")
     result_message = RESULT_MESSAGES.get(result_code, f"Unknown Result ({result_code})")
 
-    print_debug(f"[BLE] Settings response: {setting_name} → {result_message}")
+    if config.DEBUG_ENABLED:
+        print_debug(f"[BLE] Settings response: {setting_name} → {result_message}")
     parsed_result = {
         "setting_id": setting_id,
         "setting_name": setting_name,
@@ -339,11 +501,7 @@ async def handle_settings_response(char_uuid, data):
     }
 
     # Notify registered callbacks
-    for cb in _callbacks:
-        try:
-            await cb("setting_response", parsed_result)
-        except Exception as e:
-            print_error(f"Callback error: {e}")
+    await _notify_callbacks("setting_response", parsed_result)
 
     return parsed_result
 
@@ -353,64 +511,70 @@ async def handle_query_response(char_uuid, data):
 
     Args:
         char_uuid (UUID): UUID of the characteristic that sent the response.
-        data (bytes): The query response data payload.
+        data (memoryview or bytes): The query response data payload.
 
     Behavior:
         - Parses TLV-encoded status entries.
         - Logs unknown status IDs.
         - Notifies registered callbacks.
     """
-    print_debug(f"[BLE] Reassembled data received in handle_query_response: {data.hex()}")
-    statuses = {}
+    if config.DEBUG_ENABLED:
+        print_debug(f"[BLE] Reassembled data received in handle_query_response: {bytes(data).hex()}")
 
     if len(data) < 5:
-        print_error(f"[BLE] Incomplete query response: {data.hex()}")
-        return statuses
+        print_error(f"[BLE] Incomplete query response: {bytes(data).hex()}")
+        return {}
 
+    # Decoded (name, value) pairs, turned into the statuses dict in one pass after parsing
+    pairs = []
     index = 2
+    data_len = len(data)
+
+    # Local aliases keep global and attribute lookups out of the TLV loop;
+    # values are sliced from a memoryview so no bytes copy is made per entry
+    mv = memoryview(data)
+    get_parser = _STATUS_PARSERS.get
+    add_pair = pairs.append
 
-    while index + 2 <= len(data):
+    while index + 2 <= data_len:
         try:
-            status_id = data[index]
-            length = data[index + 1]
+            status_id = mv[index]
+            length = mv[index + 1]
+            value_start = index + 2
+            index = value_start + length
 
-            if index + 2 + length > len(data):
+            if index > data_len:
                 break
 
-            value = data[index + 2 : index + 2 + length]
+            # Get the status name and its specialized decoder
+            parser = get_parser(status_id)
 
-            # Get definition from combined STATUS_DEFINITIONS map
-            definition = STATUS_DEFINITIONS.get(status_id)
-
-            if definition:
-                value_type = definition["type"]
-
-                # Parse based on type
-                if value_type == "bool":
-                    decoded = bool(int.from_bytes(value, "big"))
-                elif value_type == "int":
-                    decoded = int.from_bytes(value, "big")
-                elif value_type == "string":
-                    decoded = value.decode("utf-8", errors="ignore")
-                else:
-                    decoded = value  # fallback raw bytes
+            if parser is not None:
+                status_key, decode = parser
 
                 # Store by name
-                status_key = definition["name"]
-                statuses[status_key] = decoded
+                add_pair((status_key, decode(mv[value_start:index])))
             else:
                 print_warning(f"[BLE] Unknown status ID {status_id:02X} in query response.")
 
-            index += 2 + length
-
         except Exception as e:
             print_error(f"[BLE] Error decoding TLV entry: {repr(e)}")
             break
 
-    for cb in _callbacks:
-        try:
-            await cb("query_response", statuses)
-        except Exception as e:
-            print_error(f"Callback error: {e}")
+    statuses = dict(pairs)
+    await _notify_callbacks("query_response", statuses)
 
     return statuses
+
+# Maps normalized (lowercase) response characteristic UUID strings to their handlers.
+# Built once at import, after the handlers are defined, so dispatch is a single dict lookup.
+_UUID_DISPATCH = {
+    GoProUuid.COMMAND_RSP_UUID.lower(): handle_command_response,
+    GoProUuid.SETTINGS_RSP_UUID.lower(): handle_settings_response,
+    GoProUuid.QUERY_RSP_UUID.lower(): handle_query_response,
+}
+
+# Integer-keyed dispatch needs no normalization at all
+_handler_cache[COMMAND_RSP_KEY] = handle_command_response
+_handler_cache[SETTINGS_RSP_KEY] = handle_settings_response
+_handler_cache[QUERY_RSP_KEY] = handle_query_response
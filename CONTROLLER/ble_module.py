@@ -1,14 +1,63 @@
 # L.A.U.R.A. CONTROLLER Ver.3 - ble_module.py
 import asyncio
+import struct
 import machine
+import urandom
+import utime as time
+import config
 from logger_utils import print_warning, print_error, print_debug
 import bluetooth
 from aioble.security import pair
 import aioble
+from aioble.client import ClientService, ClientCharacteristic
 from commands import GoProUuid
-from ble_handler import handle_ble_notification
+from oled_display import update_display
+from ble_handler import accumulate_notification, release_response, dispatch_response
+from ble_handler import COMMAND_RSP_KEY, SETTINGS_RSP_KEY, QUERY_RSP_KEY
 from collections import deque  # Frangmentation
 
+# UUIDs built once at import, instead of on every discovery, reconnect and subscribe
+_UUID_SERVICE = bluetooth.UUID(0xFEA6)  # GoPro primary service
+_GOPRO_NAME = b"GoPro"  # Substring of the advertised local name
+_UUID_CMD = bluetooth.UUID(GoProUuid.COMMAND_REQ_UUID)
+_UUID_SET = bluetooth.UUID(GoProUuid.SETTINGS_REQ_UUID)
+_UUID_QRY = bluetooth.UUID(GoProUuid.QUERY_REQ_UUID)
+_UUID_CMD_RSP = bluetooth.UUID(GoProUuid.COMMAND_RSP_UUID)
+_UUID_SET_RSP = bluetooth.UUID(GoProUuid.SETTINGS_RSP_UUID)
+_UUID_QRY_RSP = bluetooth.UUID(GoProUuid.QUERY_RSP_UUID)
+# Response characteristic UUIDs mapped to the integer keys ble_handler dispatches on
+_RSP_KEYS = {_UUID_CMD_RSP: COMMAND_RSP_KEY, _UUID_SET_RSP: SETTINGS_RSP_KEY, _UUID_QRY_RSP: QUERY_RSP_KEY}
+_UUID_GATT_SERVICE = bluetooth.UUID(0x1801)  # Generic Attribute service
+_UUID_SERVICE_CHANGED = bluetooth.UUID(0x2A05)  # Indicates that cached handles are stale
+
+# Registration request for the statuses the GoPro should push on change, built once from config:
+# length, REG_STATUS_VAL_UPDATE (0x53), status IDs
+_STATUS_REG_PAYLOAD = bytes((len(config.STATUS_IDS), 0x53)) + bytes(config.STATUS_IDS)
+
+# Notifications buffered for the Query response characteristic (one query response burst).
+# aioble copies each notification into a new bytes object in its IRQ handler before queueing it,
+# so the queue holds references only; reassembly then writes into pooled buffers (ble_handler).
+NOTIFY_QUEUE_SIZE = 6
+
+# Ceiling (seconds) for the jittered exponential backoff between BLE connection attempts.
+# Kept short so a GoPro that comes back is picked up quickly; the sleeps never block other tasks.
+MAX_BACKOFF = 8
+
+# Reconnection attempts made after restarting the BLE radio, before rebooting the board
+RADIO_REINIT_ATTEMPTS = 3
+
+# File on flash holding the last connected GoPro (address, GATT handles and name) in one record,
+# to skip scanning and discovery on reconnect
+DEVICE_FILE = "gopro.bin"
+
+# Record layout: address type, address, flags (bit 0: GoPro handles valid, bit 1: Service Changed
+# valid), GoPro service (start, end), 6 x characteristic (end handle, value handle, properties),
+# Generic Attribute service (start, end) and its Service Changed characteristic.
+# The advertised name follows the fixed part as UTF-8.
+_RECORD_FMT = ">B6sBHH" + "HHB" * 6 + "HHHHB"
+_RECORD_SIZE = struct.calcsize(_RECORD_FMT)
+_CACHED_CHARS = ("command", "settings", "query", "command_rsp", "settings_rsp", "query_rsp")
+
 class GoProBLE:
     def __init__(self):
         self.device = None
@@ -18,55 +67,260 @@ class GoProBLE:
         self.char_command = None
         self.char_settings = None
         self.char_query = None
+        self.char_command_rsp = None
+        self.char_settings_rsp = None
+        self.char_query_rsp = None
+        self.char_service_changed = None
         #self.notification_handler = None
         self.is_connected = False
+        self._notify_task = None  # Task draining notifications from all subscribed characteristics
+        self._service_changed_task = None  # Task watching Service Changed indications
+        self._ack_event = asyncio.Event()  # Set when the awaited command/setting response arrives
+        self._ack_key = None  # (event_type, id) of the response being awaited, None if idle
+        # Last connected GoPro {"addr_type": int, "addr": bytes, "name": str} and its cached
+        # handles {"service": [...], "command": [...], ...}, each None if unknown
+        self._last_device, self._gatt_cache = self._load_device_record()
+
+    def _load_device_record(self):
+        """
+        Load the last connected GoPro and its GATT handles from flash, with a single read.
+
+        Returns:
+            tuple: (device dict or None, handle cache dict or None).
+        """
+        try:
+            with open(DEVICE_FILE, "rb") as f:
+                data = f.read()
+            fields = struct.unpack_from(_RECORD_FMT, data, 0)
+            name = data[_RECORD_SIZE:].decode()
+        except (OSError, ValueError):
+            return None, None
+
+        device = {"addr_type": fields[0], "addr": fields[1], "name": name or None}
+        flags = fields[2]
+        handles = None
+        if flags & 1:
+            handles = {"service": list(fields[3:5])}
+            for i, char_name in enumerate(_CACHED_CHARS):
+                handles[char_name] = list(fields[5 + 3 * i:8 + 3 * i])
+            if flags & 2:
+                handles["service_changed"] = list(fields[23:28])
+        return device, handles
+
+    def _save_device_record(self):
+        """Persist the last device and its handles to flash in one write. Failures are logged and ignored."""
+        device = self._last_device
+        if not device:
+            return
+        entry = self._gatt_cache
+        flags = 0
+        handles = [0] * 25
+        if entry:
+            flags = 1
+            handles[0:2] = entry["service"]
+            for i, char_name in enumerate(_CACHED_CHARS):
+                handles[2 + 3 * i:5 + 3 * i] = entry[char_name]
+            if "service_changed" in entry:
+                flags |= 2
+                handles[20:25] = entry["service_changed"]
+        try:
+            record = struct.pack(_RECORD_FMT, device["addr_type"], device["addr"], flags, *handles)
+            with open(DEVICE_FILE, "wb") as f:
+                f.write(record + (device["name"] or "").encode())
+        except (OSError, ValueError) as e:
+            print_warning(f"[BLE] Could not save GoPro record: {e}")
+
+    def _save_last_device(self):
+        """Persist the current device address and name, if they changed."""
+        entry = {"addr_type": self.device.addr_type, "addr": bytes(self.device.addr), "name": self.device_name}
+        if entry == self._last_device:
+            return  # Avoid rewriting flash on every reconnect
+        if not self._last_device or self._last_device["addr"] != entry["addr"]:
+            self._gatt_cache = None  # Cached handles belonged to another GoPro
+        self._last_device = entry
+        self._save_device_record()
+
+    def _restore_last_device(self):
+        """
+        Set `self.device` from the saved address of the last connected GoPro.
+
+        Returns:
+            bool: True if a saved device was restored, False if none is known.
+        """
+        entry = self._last_device
+        if not entry:
+            return False
+        try:
+            self.device = aioble.Device(entry["addr_type"], entry["addr"])
+            self.device_name = entry.get("name")
+            return True
+        except (KeyError, TypeError, ValueError) as e:
+            print_warning(f"[BLE] Unusable saved GoPro address: {e}")
+            self._last_device = None
+            return False
+
+    def _device_key(self):
+        """Return the address of the current device, or None."""
+        return bytes(self.device.addr) if self.device else None
+
+    def _cached_handles(self):
+        """Return the cached handles if they belong to the current device, else None."""
+        if self._last_device and self._last_device["addr"] == self._device_key():
+            return self._gatt_cache
+        return None
+
+    def _invalidate_gatt_cache(self):
+        """Drop the cached handles for the current device so the next connect rediscovers them."""
+        if self._cached_handles() is not None:
+            print_debug(f"[BLE] Invalidating GATT cache for {self.device.addr_hex()}")
+            self._gatt_cache = None
+            self._save_device_record()
+
+    def _restore_from_gatt_cache(self, entry):
+        """
+        Rebuild the service and characteristic proxies from cached handles, without discovery.
+
+        Args:
+            entry (dict): Cached handles for the connected device.
+
+        Returns:
+            bool: True if all proxies were rebuilt, False if the entry is unusable.
+        """
+        try:
+            start_handle, end_handle = entry["service"]
+            self.service = ClientService(self.connection, start_handle, end_handle, _UUID_SERVICE)
+            self.char_command = ClientCharacteristic(self.service, *entry["command"], _UUID_CMD)
+            self.char_settings = ClientCharacteristic(self.service, *entry["settings"], _UUID_SET)
+            self.char_query = ClientCharacteristic(self.service, *entry["query"], _UUID_QRY)
+            self.char_command_rsp = ClientCharacteristic(self.service, *entry["command_rsp"], _UUID_CMD_RSP)
+            self.char_settings_rsp = ClientCharacteristic(self.service, *entry["settings_rsp"], _UUID_SET_RSP)
+            self.char_query_rsp = ClientCharacteristic(self.service, *entry["query_rsp"], _UUID_QRY_RSP)
+            self.char_service_changed = None
+            if "service_changed" in entry:
+                gatt_start, gatt_end, *char_handles = entry["service_changed"]
+                gatt_service = ClientService(self.connection, gatt_start, gatt_end, _UUID_GATT_SERVICE)
+                self.char_service_changed = ClientCharacteristic(gatt_service, *char_handles, _UUID_SERVICE_CHANGED)
+            return True
+        except (KeyError, TypeError, ValueError) as e:
+            print_warning(f"[BLE] Unusable GATT cache entry, rediscovering: {e}")
+            return False
+
+    def _store_gatt_cache(self):
+        """Record the handles of the discovered service and characteristics for the current device."""
+        # Handles are stored alongside the device record, so only for the last connected GoPro
+        if not self._last_device or self._last_device["addr"] != self._device_key():
+            return
+        if not (self.char_command and self.char_settings and self.char_query
+                and self.char_command_rsp and self.char_settings_rsp and self.char_query_rsp):
+            return
+
+        def handles(char):
+            return [char._end_handle, char._value_handle, char.properties]
+
+        self._gatt_cache = {
+            "service": [self.service._start_handle, self.service._end_handle],
+            "command": handles(self.char_command),
+            "settings": handles(self.char_settings),
+            "query": handles(self.char_query),
+            "command_rsp": handles(self.char_command_rsp),
+            "settings_rsp": handles(self.char_settings_rsp),
+            "query_rsp": handles(self.char_query_rsp),
+        }
+        char = self.char_service_changed
+        if char:
+            self._gatt_cache["service_changed"] = [char.service._start_handle, char.service._end_handle] + handles(char)
+        self._save_device_record()
 
     async def scan_for_gopro(self, scan_duration=3000):
         """
         Scan for nearby GoPro devices via BLE.
 
-        Performs an active BLE scan for a given duration, looking for devices that
+        Performs a passive BLE scan for a given duration, looking for devices that
         advertise a name containing "GoPro" and include the GoPro service UUID (0xFEA6).
-        If found, stores the device and device name for later connection.
+        If nothing matches, repeats the scan in active mode so names carried only in
+        scan responses are seen too. If found, stores the device and device name for
+        later connection.
 
         Args:
-            scan_duration (int): BLE scan duration in milliseconds (default 3000).
+            scan_duration (int): BLE scan duration in milliseconds for each pass (default 3000).
 
         Returns:
             bool: True if a matching GoPro device is found, False otherwise.
 
         Notes:
-            - Uses a 30 ms scan interval and window.
+            - Uses the scan interval and window from config (continuous, low-latency scanning by
+              default), with each pass limited to `scan_duration`.
             - Requires BLE hardware and aioble scan context.
             - This method handles exceptions internally and logs errors.
         """
         print_debug("[BLE] Starting scan for devices...")
 
-        async with aioble.scan(duration_ms=scan_duration, interval_us=30000, window_us=30000, active=True) as scanner:
-            async for result in scanner:
-                name = result.name() or "Unnamed device"  # Get the device name
-                services = list(result.services()) if result.services() else []  # Get services
-                
-                # Print discovered device details
-                print_debug(f"[BLE] Discovered: {name}, Services: {services}")
-
-                # Check if it's a GoPro with the required service
-                if "GoPro" in name and bluetooth.UUID(0xFEA6) in services:
-                # if bluetooth.UUID(0xFEA6) in services:
-                    self.device_name = name
-                    self.device = result.device
-                    print_debug(f"[BLE] GoPro found: {self.device_name}, Services: {services}")
+        # Passive first: no scan requests are transmitted
+        if await self._scan_pass(scan_duration, active=False):
+            return True
 
-                    return True  # Indicate success
+        print_debug("[BLE] No GoPro found in passive scan, retrying with active scan...")
+        if await self._scan_pass(scan_duration, active=True):
+            return True
 
         print_warning("[BLE] Scan complete. No matching GoPro found.")
         return False  # Indicate failure
 
+    async def _scan_pass(self, scan_duration, active):
+        """
+        Run a single BLE scan pass and store the first matching GoPro.
+
+        Args:
+            scan_duration (int): BLE scan duration in milliseconds.
+            active (bool): Whether to send scan requests to fetch scan response data.
+
+        Returns:
+            bool: True if a matching GoPro device is found, False otherwise.
+
+        Notes:
+            Breaks out of the scan on the first match, so the HCI scan is stopped right away
+            when the scan context exits instead of running for the rest of `scan_duration`.
+        """
+        found = None
+        async with aioble.scan(
+            duration_ms=scan_duration,
+            interval_us=config.BLE_SCAN_INTERVAL_US,
+            window_us=config.BLE_SCAN_WINDOW_US,
+            active=active,
+        ) as scanner:
+            async for result in scanner:
+                # Cheapest reject first: a C-level substring search of the raw advertisement and
+                # scan response, before anything is decoded into UUID or str objects
+                adv = result.adv_data
+                resp = result.resp_data
+                if not ((adv and _GOPRO_NAME in adv) or (resp and _GOPRO_NAME in resp)):
+                    continue
+
+                # The membership test stops at the first match without building a list
+                if _UUID_SERVICE not in result.services():
+                    continue
+
+                name = result.name()  # Get the device name
+                if not name or "GoPro" not in name:
+                    continue
+
+                found = (result.device, name)
+                break
+
+        if found is None:
+            return False
+
+        self.device, self.device_name = found
+        print_debug(f"[BLE] GoPro found: {self.device_name}")
+        return True  # Indicate success
+
     async def connect(self, connect_timeout=5000):
         """
         Attempts to establish a BLE connection with the previously discovered GoPro device.
 
         This method connects to the BLE device found during scanning and performs secure pairing.
+        A short connection interval (`config.BLE_MIN/MAX_CONN_INTERVAL_US`) is requested so each
+        later GATT write waits less for the next connection event.
         It sets up the internal connection state and updates `is_connected` to reflect the result.
 
         Args:
@@ -90,12 +344,17 @@ class GoProBLE:
         try:
             print_debug(f"[BLE] Connecting to {self.device_name}...")
 
-            self.connection = await self.device.connect(timeout_ms=connect_timeout)
+            self.connection = await self.device.connect(
+                timeout_ms=connect_timeout,
+                min_conn_interval_us=config.BLE_MIN_CONN_INTERVAL_US,
+                max_conn_interval_us=config.BLE_MAX_CONN_INTERVAL_US,
+            )
             print_debug(f"[BLE] Connected to {self.device_name}")
 
             print_debug("[BLE] Pairing with GoPro...")
             await pair(self.connection)
             self.is_connected = True
+            self._save_last_device()
             print_debug(f"[BLE] Paired with {self.device_name}")
             return True
         
@@ -134,6 +393,10 @@ class GoProBLE:
                 self.char_command = None
                 self.char_settings = None
                 self.char_query = None
+                self.char_command_rsp = None
+                self.char_settings_rsp = None
+                self.char_query_rsp = None
+                self.char_service_changed = None
                 return True
             
             except Exception as e:
@@ -147,38 +410,65 @@ class GoProBLE:
         Attempts to reconnect to the GoPro device by performing a full disconnect
         followed by repeated connection and subscription attempts.
 
-        Implements a retry mechanism with exponential backoff, trying up to a fixed
-        number of attempts (default 5). If all attempts fail, the device is rebooted
-        to recover from the failure state.
+        If the link is still up (no disconnect event has been received), the existing
+        connection and discovered characteristics are reused and no radio work is done.
+
+        Implements a retry mechanism with jittered exponential backoff, retrying until
+        `config.RECONNECT_TIMEOUT` seconds have elapsed. If all attempts fail, the BLE radio
+        is restarted and a few more attempts are made; only if those fail too is the device
+        rebooted to recover from the failure state.
 
         Returns:
-            bool: True if reconnection and subscription succeed within retry attempts.
+            bool: True if reconnection and subscription succeed before the deadline.
                   False if the function returns (which it normally won't, due to reboot).
 
         Behavior:
             - Performs a clean disconnect before retrying.
-            - Uses exponential backoff delay between retries (starting at 2 seconds).
+            - Waits a random delay between 0 and a backoff ceiling that starts at 2 seconds
+              and doubles up to MAX_BACKOFF seconds ("full jitter"), so several controllers do not
+              retry in lockstep.
             - Logs connection attempts and errors.
-            - Calls `machine.reset()` to reboot the device if reconnection repeatedly fails.
+            - Restarts the BLE controller (`aioble.stop()`) to clear a stuck radio state without
+              losing application state, then retries up to RADIO_REINIT_ATTEMPTS times.
+            - Calls `machine.reset()` to reboot the device if reconnection still fails.
         
         Note:
             The final return False will never be reached because `machine.reset()` resets the device.
         """
+        if self.connection and self.connection.is_connected() and self.char_query:
+            print_debug("[BLE] Link still up, reusing the existing connection.")
+            return True
+
         print_warning("[BLE] Attempting to reconnect...")
         await self.disconnect()  # Ensure a clean disconnect
-        retry_attempts = 5
-        delay = 2  # Initial delay (seconds)
+        deadline = time.ticks_add(time.ticks_ms(), config.RECONNECT_TIMEOUT * 1000)
+        base = 2  # Initial backoff ceiling (seconds)
+        attempt = 0
 
-        for attempt in range(retry_attempts):
-            print_debug(f"[BLE] Reconnection attempt {attempt + 1}/{retry_attempts}...")
+        while True:
+            attempt += 1
+            print_debug(f"[BLE] Reconnection attempt {attempt}...")
             if await self.connect_and_subscribe():
                 print_debug("[BLE] Reconnected successfully!")
                 return True
-            print_warning(f"[BLE] Reconnection failed. Retrying in {delay} seconds...")
+            if time.ticks_diff(deadline, time.ticks_ms()) <= 0:
+                break
+            delay = urandom.uniform(0, base)
+            print_warning(f"[BLE] Reconnection failed. Retrying in {delay:.1f} seconds...")
             await asyncio.sleep(delay)
-            delay *= 2  # Exponential backoff
+            base = min(base * 2, MAX_BACKOFF)  # Exponential backoff ceiling
+
+        print_error("[BLE] Reconnection failed after multiple attempts. Restarting BLE radio...")
+        await self.disconnect()
+        aioble.stop()  # Deactivates the controller; aioble reactivates it on next use
+        await asyncio.sleep_ms(200)
+        for attempt in range(RADIO_REINIT_ATTEMPTS):
+            if await self.connect_and_subscribe():
+                print_debug("[BLE] Reconnected after radio restart.")
+                return True
+            await asyncio.sleep(urandom.uniform(0, base))
 
-        print_error("[BLE] Reconnection failed after multiple attempts. Rebooting device...")
+        print_error("[BLE] Reconnection failed after radio restart. Rebooting device...")
         machine.reset()  # Perform a soft reboot
         return False  # This line won't be reached since the device resets
 
@@ -190,7 +480,8 @@ class GoProBLE:
         and attempts to resolve the three main characteristics used for:
             - command transmission,
             - settings control,
-            - device queries.
+            - device queries,
+        together with their matching response (notification) characteristics.
 
         Returns:
             bool: True if the service and all key characteristics are found; False otherwise.
@@ -199,8 +490,11 @@ class GoProBLE:
             - Must be connected to the GoPro (`self.connection` must be active).
 
         Side Effects:
-            - Populates `self.service`, `self.char_command`, `self.char_settings`, and `self.char_query`.
+            - Populates `self.service`, `self.char_command`, `self.char_settings`, `self.char_query`
+              and the corresponding `*_rsp` characteristics.
             - Logs warnings for any missing characteristic.
+            - Reuses handles cached for this device address when available, and caches
+              the handles after a successful live discovery.
 
         Logs:
             - Service and characteristic discovery status and errors.
@@ -208,16 +502,36 @@ class GoProBLE:
         if not self.connection:
             print_debug("[BLE] Not connected. Connect first.")
             return False
+
+        entry = self._cached_handles()
+        if entry and self._restore_from_gatt_cache(entry):
+            print_debug("[BLE] Using cached GoPro GATT handles.")
+            return True
+
         try:
             print_debug("[BLE] Discovering GoPro service...")
-            self.service = await self.connection.service(bluetooth.UUID(0xFEA6))
+            self.service = await self.connection.service(_UUID_SERVICE)
             if self.service:
                 print_debug("[BLE] GoPro service found.")
 
-                # Discover the specific characteristics for commands, settings, and queries
-                self.char_command = await self.service.characteristic(bluetooth.UUID(GoProUuid.COMMAND_REQ_UUID))
-                self.char_settings = await self.service.characteristic(bluetooth.UUID(GoProUuid.SETTINGS_REQ_UUID))
-                self.char_query = await self.service.characteristic(bluetooth.UUID(GoProUuid.QUERY_REQ_UUID))
+                # Discover the request and response characteristics for commands, settings, and
+                # queries in a single pass over the service (aioble allows only one discovery at
+                # a time per connection)
+                self.char_command = self.char_settings = self.char_query = None
+                self.char_command_rsp = self.char_settings_rsp = self.char_query_rsp = None
+                async for char in self.service.characteristics():
+                    if char.uuid == _UUID_CMD:
+                        self.char_command = char
+                    elif char.uuid == _UUID_SET:
+                        self.char_settings = char
+                    elif char.uuid == _UUID_QRY:
+                        self.char_query = char
+                    elif char.uuid == _UUID_CMD_RSP:
+                        self.char_command_rsp = char
+                    elif char.uuid == _UUID_SET_RSP:
+                        self.char_settings_rsp = char
+                    elif char.uuid == _UUID_QRY_RSP:
+                        self.char_query_rsp = char
 
                 if not self.char_command:
                     print_error("[BLE] Command characteristic not found.")
@@ -226,6 +540,17 @@ class GoProBLE:
                 if not self.char_query:
                     print_error("[BLE] Query characteristic not found.")
 
+                # Service Changed lets the GoPro tell us when cached handles become stale.
+                # Optional: a failed lookup is only logged and never fails the connection
+                self.char_service_changed = None
+                try:
+                    gatt_service = await self.connection.service(_UUID_GATT_SERVICE)
+                    if gatt_service:
+                        self.char_service_changed = await gatt_service.characteristic(_UUID_SERVICE_CHANGED)
+                except Exception as e:
+                    print_warning(f"[BLE] Service Changed characteristic not available: {e}")
+
+                self._store_gatt_cache()
                 return True
             print_error("[BLE] GoPro service not found.")
             return False
@@ -233,132 +558,198 @@ class GoProBLE:
             print_error(f"[BLE] Error discovering service: {e}")
             return False
 
-    async def subscribe_to_characteristics(self, characteristic_uuids, notify_queue_size=None):
+    async def subscribe_all(self):
         """
-        Subscribes to BLE characteristics and starts processing their notifications.
-
-        Args:
-            characteristic_uuids (list): A list of characteristic UUIDs (as strings or integers)
-                                         to subscribe to. These should match the service's known characteristics.
-            notify_queue_size (int, optional): If provided, sets a fixed-size queue for incoming
-                                               notifications on each characteristic.
+        Subscribes to the Command, Settings, and Query response characteristics found during
+        service discovery and starts processing their notifications.
 
         Returns:
             bool: True if all subscriptions were successfully started, False otherwise.
 
         Notes:
-            - This method requires `self.service` to be set beforehand by a successful service discovery.
-            - For each subscribed characteristic, a background task is created to handle notifications
-              via `self._process_notification(char)`.
-            - If a characteristic is not found or subscription fails, an error is logged but the loop continues.
+            - Reuses the characteristics resolved by `discover_service()` instead of looking
+              each one up again, saving a GATT round trip per characteristic.
+            - Subscriptions are awaited one after another: each one discovers the CCCD
+              descriptor, and aioble allows only one discovery at a time per connection.
+            - The Query response characteristic gets a NOTIFY_QUEUE_SIZE-packet notification
+              queue, since query responses arrive as bursts of fragments.
+            - Notifications from all three are drained by a single `_process_notifications()`
+              task, replacing the one left over from a previous connection.
+            - Also subscribes to Service Changed indications when the GoPro exposes them, so
+              the GATT handle cache is dropped when its database changes (best effort, see
+              `_subscribe_service_changed()`).
+            - Finally registers for the statuses in `config.STATUS_IDS` with a prebuilt
+              request written to `self.char_query`; a failed registration is only logged.
         """
-        if not self.service:
-            print_debug("[BLE] Service not discovered. Discover service first.")
+        chars = (
+            (self.char_command_rsp, None),
+            (self.char_settings_rsp, None),
+            (self.char_query_rsp, NOTIFY_QUEUE_SIZE),
+        )
+        if not all(char for char, _ in chars):
+            print_error("[BLE] Response characteristics not discovered. Discover service first.")
             return False
         try:
             print_debug("[BLE] Subscribing to characteristics...")
-            for char_uuid in characteristic_uuids:
-                char = await self.service.characteristic(bluetooth.UUID(char_uuid))
-                if char:
-                    print_debug(f"[BLE] Subscribed to {char_uuid}.")
-                    if notify_queue_size is not None:
-                        char._notify_queue = deque((), notify_queue_size)
-                    await char.subscribe(notify=True)
-                    asyncio.create_task(self._process_notification(char))
-                else:
-                    print_error(f"[BLE] Characteristic {char_uuid} not found.")
-            return True
+            # Shared wake-up flag, installed before subscribing so no early notification can
+            # signal a characteristic's own event that the notification task never waits on
+            wake = asyncio.ThreadSafeFlag()
+            for char, notify_queue_size in chars:
+                char._notify_event = wake
+                if notify_queue_size is not None:
+                    char._notify_queue = deque((), notify_queue_size)
+                await char.subscribe(notify=True)
+            # One task serves all three characteristics; drop the one left from a previous connection
+            if self._notify_task:
+                self._notify_task.cancel()
+            self._notify_task = asyncio.create_task(self._process_notifications(tuple(char for char, _ in chars), wake))
+            print_debug("[BLE] Subscribed to Command, Settings and Query responses.")
+            await self._subscribe_service_changed()
+
         except Exception as e:
+            if isinstance(e, aioble.GattError):
+                self._invalidate_gatt_cache()
             print_error(f"[BLE] Error subscribing to characteristics: {e}")
             return False
 
-    async def register_status_notifications(self, status_codes):
-        """
-        Sends a registration request to receive BLE notifications for specific GoPro status codes.
-
-        This method writes a structured payload to the GoPro's Query Request Characteristic to
-        enable updates for the selected statuses. It is used to monitor events such as
-        overheating or encoding state.
-
-        Args:
-            status_codes (list of int): A list of status codes (as bytes) to subscribe to.
-                Known values include:
-                    - 0x0A: Encoding status
-                    - 0x55: Low temperature warning
-                    - 0x06: Overheating warning
+        # Register for specific statuses on the already-discovered query characteristic.
+        # A failure is only logged: the connection stays usable without status pushes
+        if not self.char_query:
+            print_error("[BLE] Query Request Characteristic not found. Status updates not registered.")
+            return True
+        try:
+            await self.char_query.write(_STATUS_REG_PAYLOAD, response=True)
+            print_debug("[BLE] Registered for status updates.")
+        except Exception as e:
+            print_error(f"[BLE] Error registering for status notifications: {e}")
+        return True
 
-        Returns:
-            bool: True if registration request was successfully sent, False otherwise.
+    async def _subscribe_service_changed(self):
+        """
+        Subscribe to Service Changed indications, if discovered, and (re)start their watcher.
 
         Notes:
-            - If no `status_codes` are provided, registration is skipped with a warning.
-            - A fixed request type (0x53, REG_STATUS_VAL_UPDATE) is used to indicate registration intent.
-            - The service and characteristic must have been discovered prior to calling this method.
+            Service Changed only supports indications, so notifications are explicitly left off.
+            This is optional: any failure is logged and never fails the connection.
         """
+        if self._service_changed_task:
+            self._service_changed_task.cancel()
+            self._service_changed_task = None
+        char = self.char_service_changed
+        if not char:
+            return
         try:
-            query_request_uuid = bluetooth.UUID(GoProUuid.QUERY_REQ_UUID)
-            status_char = await self.service.characteristic(query_request_uuid)
-
-            if not status_char:
-                print_error("[BLE] Query Request Characteristic not found.")
-                return False
-
-            if not status_codes:
-                print_warning("[BLE] No status codes provided for registration. Skipping registration.")
-                return False
+            await char.subscribe(notify=False, indicate=True)
+        except Exception as e:
+            print_warning(f"[BLE] Could not subscribe to Service Changed indications: {e}")
+            return
+        self._service_changed_task = asyncio.create_task(self._watch_service_changed(char))
 
-            length = len(status_codes)
-            request_type = 0x53  # REG_STATUS_VAL_UPDATE, fixed in function
-            payload = bytes([length, request_type] + status_codes)
+    async def _watch_service_changed(self, char):
+        """
+        Invalidate the GATT handle cache whenever the GoPro indicates a Service Changed event.
 
-            print_debug(f"[BLE] Registering for status notifications with payload: {payload.hex()}")
-            await status_char.write(payload, response=True)
-            print_debug("[BLE] Successfully registered for status updates.")
-            return True
+        Args:
+            char: The Service Changed (0x2A05) characteristic, subscribed for indications.
 
-        except Exception as e:
-            print_error(f"[BLE] Error registering for status notifications: {e}")
-            return False
+        Notes:
+            Runs until the connection drops; the next discovery then repopulates the cache.
+        """
+        while True:
+            try:
+                await char.indicated()
+            except Exception:
+                return  # Disconnected
+            print_warning("[BLE] GoPro GATT database changed.")
+            self._invalidate_gatt_cache()
 
-    async def _process_notification(self, char):
+    async def _process_notifications(self, chars, wake):
         """
-        Continuously listens for BLE notifications from the specified characteristic,
-        assembles fragmented packets if present, and passes them to the handler.
+        Continuously listens for BLE notifications from all the given characteristics in a
+        single task, assembles fragmented packets if present, and passes them to the handler.
 
         Args:
-            char: The BLE characteristic object to listen to for notifications.
+            chars (tuple): The subscribed BLE characteristic objects to listen to.
+            wake (ThreadSafeFlag): Flag already installed as the `_notify_event` of every
+                characteristic in `chars` (see `subscribe_all()`).
 
         Behavior:
-            - Awaits incoming notifications from the given characteristic.
-            - Collects the first packet and any subsequent packets in the queue.
-            - Logs each packet with its index and length.
-            - Sends each packet to the appropriate BLE handler for processing.
+            - Waits on the shared wake-up flag of all the characteristics.
+            - On wake-up, drains the notify queue of each characteristic in turn.
+            - Logs each packet with its index and length when debug output is enabled.
+            - Feeds every queued packet into the reassembly buffer, yielding only when a
+              message completes.
+            - Runs the BLE handler on each complete message inline, straight from the
+              accumulator's buffer (no copy), then releases the buffer. Responses are thus
+              handled in arrival order (a stale query response can never overwrite a newer
+              one); notifications arriving meanwhile wait in aioble's notify queues.
             - Handles and logs exceptions without breaking the notification loop.
 
         Notes:
             This method is intended to run indefinitely as part of an asyncio task.
+            It reads aioble's per-characteristic `_notify_queue` directly instead of awaiting
+            `char.notified()`: aioble sets `_notify_event` when a queue goes from empty to
+            non-empty, so sharing one flag lets a single task serve all characteristics.
         """
-        while True:
-            data = None  # <--- This ensures 'data' always exists
-            try:
-                data = await char.notified()
+        sources = []
+        for char in chars:
+            # Resolved once, reused for every packet: an int key where known, else the UUID
+            sources.append((_RSP_KEYS.get(char.uuid, char.uuid), char._notify_queue))
 
-                # Read initial packet
-                packets = [data]
+        while True:
+            await wake.wait()
+            for uuid, queue in sources:
+                pkt = None  # <--- This ensures 'pkt' always exists
+                try:
+                    # Reassemble all queued fragments, yielding only at message boundaries
+                    i = 0
+                    while queue:
+                        pkt = queue.popleft()
+                        i += 1
+                        if config.DEBUG_ENABLED:
+                            # The packet bytes themselves are logged (hex) by the accumulator
+                            print_debug(f"[BLE] Notification #{i} from {uuid} (length: {len(pkt)})")
+                        message = accumulate_notification(uuid, pkt)
+                        if message is None:
+                            continue
+                        # The message is a view into the accumulator buffer: parse it in place,
+                        # and only release the buffer once the handler is done with it
+                        try:
+                            await dispatch_response(uuid, message)
+                        except Exception as e:
+                            print_error(f"[BLE] Error handling response from {uuid}: {e}")
+                        finally:
+                            release_response(uuid)
+
+                except Exception as e:
+                    print_error(f"[BLE] Error processing notification from {uuid}. Data: {pkt.hex() if pkt else 'None'}. Error: {str(e)}")
+                    continue  # Ensure the loop keeps running
+
+    async def _get_char(self, attr, uuid):
+        """
+        Return a request characteristic, resolving it on first use if discovery missed it.
 
-                # Pull remaining packets from queue
-                while len(char._notify_queue) > 0:
-                    packets.append(char._notify_queue.popleft())
+        Args:
+            attr (str): Name of the attribute memoizing the characteristic (e.g. "char_command").
+            uuid (bluetooth.UUID): UUID of the characteristic.
 
-                # Log each packet for now
-                for i, pkt in enumerate(packets):
-                    print_debug(f"[BLE] Notification #{i+1} from {char.uuid}: {pkt.hex()} (length: {len(pkt)})")
-                    await handle_ble_notification(char.uuid, pkt)
+        Returns:
+            ClientCharacteristic or None: The characteristic, or None if it cannot be resolved.
 
+        Notes:
+            Normally `discover_service()` (or the GATT cache) has already set the attribute, so
+            this costs nothing; the GATT lookup only happens once, and its result is kept.
+        """
+        char = getattr(self, attr)
+        if char is None and self.service:
+            try:
+                char = await self.service.characteristic(uuid)
             except Exception as e:
-                print_error(f"[BLE] Error processing notification from {char.uuid}. Data: {data.hex() if data else 'None'}. Error: {str(e)}")
-                continue  # Ensure the loop keeps running
-    
+                print_error(f"[BLE] Error resolving characteristic {uuid}: {e}")
+                return None
+            setattr(self, attr, char)
+        return char
+
     async def send_command(self, command):
         """
         Sends a BLE command to the GoPro via the command characteristic.
@@ -373,14 +764,18 @@ class GoProBLE:
             - Requires the command characteristic to be discovered and available.
             - Logs errors if the characteristic is missing or if sending fails.
         """
-        if not self.char_command:
+        char = await self._get_char("char_command", _UUID_CMD)
+        if not char:
             print_error("[BLE] Command characteristic not available. Connect and discover service first.")
             return False
         try:
-            print_debug(f"[BLE] Sending command: {command.hex()}")
-            await self.char_command.write(command)
+            if config.DEBUG_ENABLED:
+                print_debug(f"[BLE] Sending command: {command.hex()}")
+            await char.write(command)
             return True
         except Exception as e:
+            if isinstance(e, aioble.GattError):
+                self._invalidate_gatt_cache()
             print_error(f"[BLE] Error sending command: {e}")
             return False
 
@@ -398,17 +793,97 @@ class GoProBLE:
             - Requires the settings characteristic to be discovered and available.
             - Logs debug information before sending and errors on failure.
         """
-        if not self.char_settings:
+        char = await self._get_char("char_settings", _UUID_SET)
+        if not char:
             print_debug("[BLE] Settings characteristic not available. Discover service first.")
             return False
         try:
-            print_debug(f"[BLE] Sending settings request: {payload.hex()}")
-            await self.char_settings.write(payload)
+            if config.DEBUG_ENABLED:
+                print_debug(f"[BLE] Sending settings request: {payload.hex()}")
+            await char.write(payload)
             return True
         except Exception as e:
+            if isinstance(e, aioble.GattError):
+                self._invalidate_gatt_cache()
             print_error(f"[BLE] Error sending settings request: {e}")
             return False
 
+    def acknowledge(self, event_type, data):
+        """
+        Wakes a pending `send_command_and_wait` / `send_settings_and_wait` call.
+
+        Meant to be called from the registered BLE event callback with every parsed
+        event; only the response matching the awaited command or setting ID counts.
+
+        Args:
+            event_type (str): Event type ("command_response", "setting_response", ...).
+            data (dict): Parsed event data.
+        """
+        key = self._ack_key
+        if key is not None and key[0] == event_type and data.get(key[1]) == key[2]:
+            self._ack_event.set()
+
+    async def _send_and_wait(self, send, payload, event_type, id_field, timeout_ms):
+        """
+        Sends a payload and waits for the camera's response to it.
+
+        Args:
+            send (coroutine function): `send_command` or `send_settings_request`.
+            payload (bytes): Length-prefixed payload; byte 1 is the command/setting ID.
+            event_type (str): Response event expected for this payload.
+            id_field (str): Key holding the command/setting ID in the parsed response.
+            timeout_ms (int): Maximum time to wait for the response.
+
+        Returns:
+            bool: True if the response arrived, False if sending failed or it timed out.
+        """
+        self._ack_key = (event_type, id_field, payload[1])
+        self._ack_event.clear()
+        try:
+            if not await send(payload):
+                return False
+            await asyncio.wait_for(self._ack_event.wait(), timeout_ms / 1000)
+            return True
+        except asyncio.TimeoutError:
+            print_warning(f"[BLE] No response to {payload.hex()} within {timeout_ms} ms")
+            return False
+        finally:
+            self._ack_key = None
+
+    async def send_command_and_wait(self, command, timeout_ms=500):
+        """
+        Sends a BLE command and waits for its command response.
+
+        Args:
+            command (bytes): The command payload to send.
+            timeout_ms (int): Maximum time to wait for the response. Defaults to 500.
+
+        Returns:
+            bool: True if the camera responded in time, False otherwise.
+
+        Notes:
+            - Requires `acknowledge` to be fed the parsed BLE events.
+            - Only one command or setting can be awaited at a time.
+        """
+        return await self._send_and_wait(self.send_command, command, "command_response", "command_id", timeout_ms)
+
+    async def send_settings_and_wait(self, payload, timeout_ms=500):
+        """
+        Sends a settings request and waits for its settings response.
+
+        Args:
+            payload (bytes): The settings data to be sent.
+            timeout_ms (int): Maximum time to wait for the response. Defaults to 500.
+
+        Returns:
+            bool: True if the camera responded in time, False otherwise.
+
+        Notes:
+            - Requires `acknowledge` to be fed the parsed BLE events.
+            - Only one command or setting can be awaited at a time.
+        """
+        return await self._send_and_wait(self.send_settings_request, payload, "setting_response", "setting_id", timeout_ms)
+
     async def send_query_request(self, payload, retry=True):
         """
         Sends a query request payload to the GoPro via the query characteristic.
@@ -425,7 +900,9 @@ class GoProBLE:
         Behavior:
             - If the query characteristic is not available, attempts to reconnect once
               if `retry` is True, then retries sending the request.
-            - On exceptions during sending, attempts reconnection and retry similarly.
+            - If the write times out but the link is still up, retries the write once
+              without reconnecting.
+            - On other exceptions during sending, attempts reconnection and retry similarly.
             - If reconnection fails or retry is disabled, returns False.
 
         Logs:
@@ -433,22 +910,35 @@ class GoProBLE:
             - Debug info when sending.
             - Errors on failure and reconnection attempts.
         """
-        if not self.char_query:
-            print_warning("[BLE] Query characteristic not available. Attempting reconnection...")
-            if retry and await self.reconnect():
-                return await self.send_query_request(payload, retry=False)
-            return False
-        
-        try:
-            print_debug(f"[BLE] Sending query request: {payload.hex()}")
-            await self.char_query.write(payload)
-            return True
-        except Exception as e:
-            print_error(f"[BLE] Error sending query request: {e}. Attempting reconnection...")
-            if retry and await self.reconnect():
-                return await self.send_query_request(payload, retry=False)
-            return False
-        
+        # At most two passes: the second only after a reconnect or an in-place retry
+        for attempt in range(2 if retry else 1):
+            char = await self._get_char("char_query", _UUID_QRY)
+            if not char:
+                print_warning("[BLE] Query characteristic not available. Attempting reconnection...")
+                if attempt or not retry or not await self.reconnect():
+                    return False
+                continue
+
+            try:
+                if config.DEBUG_ENABLED:
+                    print_debug(f"[BLE] Sending query request: {payload.hex()}")
+                await char.write(payload)
+                return True
+            except asyncio.TimeoutError:
+                # Transient: a plain retry is much cheaper than a full scan/connect/discover cycle
+                if not attempt and retry and self.connection and self.connection.is_connected():
+                    print_warning("[BLE] Query request timed out. Retrying on the same connection...")
+                    continue
+                print_error("[BLE] Query request timed out.")
+                return False
+            except Exception as e:
+                if isinstance(e, aioble.GattError):
+                    self._invalidate_gatt_cache()
+                print_error(f"[BLE] Error sending query request: {e}. Attempting reconnection...")
+                if attempt or not retry or not await self.reconnect():
+                    return False
+        return False
+
     async def connect_and_subscribe(self, retry_indefinitely=False):
         """
         Performs a full connection sequence to the GoPro device including scanning,
@@ -469,72 +959,55 @@ class GoProBLE:
                   False if any step failed and retries are not enabled.
 
         Behavior:
+            - On the first attempt only, connects directly to the last connected GoPro if its
+              address was saved, falling back to scanning if that fails.
             - Scans for a GoPro device.
             - Connects to the found device.
             - Discovers the GoPro BLE service.
-            - Subscribes to the Command, Settings, and Query response characteristics.
-            - Registers for specific status notifications (encoding, low temp, overheating).
+            - Subscribes to the Command, Settings, and Query response characteristics and
+              registers for specific status notifications (encoding, low temp, overheating).
             - Updates the OLED display with status messages at each step.
-            - If any step fails, optionally retries after a short delay or exits based on `retry_indefinitely`.
+            - Runs the steps from a table; if any step fails, optionally retries after a jittered,
+              exponentially growing delay or exits based on `retry_indefinitely`.
 
         Side Effects:
-            - May perform multiple retries with delays.
+            - May perform multiple retries with delays (random, up to a ceiling doubling from 2 s to MAX_BACKOFF).
             - Updates the OLED display asynchronously to reflect connection progress.
         """ 
-        from oled_display import update_display  # Import function here for lazy loading
+        # (method, progress display, failure display, disconnect on failure)
+        steps = (
+            (self.scan_for_gopro, ("Scanning...", "for GoPro"), ("No GoPro", "found"), False),
+            (self.connect, ("Connecting", None), ("Conn.", "failed"), False),
+            (self.discover_service, ("Discovering", "services..."), ("Service", "failed"), True),
+            (self.subscribe_all, ("Subscr.", "notif..."), ("Subscr.", "failed"), True),
+        )
+        base = 2  # Initial backoff ceiling (seconds)
+        try_saved = True  # Only the first attempt goes to the saved GoPro; retries always scan
 
         while True:
-            update_display("Scanning...", "for GoPro")
-            if not await self.scan_for_gopro():
-                update_display("No GoPro", "found")
-                if not retry_indefinitely:
-                    return False
-                await asyncio.sleep(2)
-                continue
-
-            update_display("Connecting", self.device_name or "")
-            if not await self.connect():
-                update_display("Conn.", "failed")
-                if not retry_indefinitely:
-                    return False
-                await asyncio.sleep(2)
-                continue
-
-            update_display("Discovering", "services...")
-            if not await self.discover_service():
-                update_display("Service", "failed")
-                await self.disconnect()
-                if not retry_indefinitely:
-                    return False
-                await asyncio.sleep(2)
-                continue
-
-            update_display("Subscr.", "notif...")
-            if not await self.subscribe_to_characteristics([GoProUuid.COMMAND_RSP_UUID]):
-                update_display("Subscr.", "failed")
-                await self.disconnect()
-                if not retry_indefinitely:
-                    return False
-                await asyncio.sleep(2)
-                continue
-
-            if not await self.subscribe_to_characteristics([GoProUuid.SETTINGS_RSP_UUID]):
-                update_display("Subscr.", "failed")
-                await self.disconnect()
-                if not retry_indefinitely:
-                    return False
-                await asyncio.sleep(2)
-                continue
-
-            if not await self.subscribe_to_characteristics([GoProUuid.QUERY_RSP_UUID], notify_queue_size=6):
-                update_display("Subscr.", "failed")
-                await self.disconnect()
-                if not retry_indefinitely:
-                    return False
-                await asyncio.sleep(2)
-                continue
-            
-            # Register for specific statuses
-            await self.register_status_notifications([0x0A, 0x55, 0x06])
-
-            return True  # Success
\ No newline at end of file
+            # Warm reconnect: try the last known GoPro directly, and only scan if that fails
+            first_step = 0
+            if try_saved and self._restore_last_device():
+                update_display("Connecting", self.device_name or "")
+                if await self.connect():
+                    first_step = 2  # Skip scan and connect
+                else:
+                    print_warning("[BLE] Saved GoPro not reachable. Scanning...")
+                    self.device = None
+            try_saved = False
+
+            for step, (line1, line2), failure, disconnect in steps[first_step:]:
+                # The device name is only known once the scan step has run
+                update_display(line1, line2 if line2 is not None else (self.device_name or ""))
+                if not await step():
+                    update_display(*failure)
+                    if disconnect:
+                        await self.disconnect()
+                    break
+            else:
+                return True  # Success
+
+            if not retry_indefinitely:
+                return False
+            await asyncio.sleep(urandom.uniform(0, base))  # Full-jitter backoff, as in reconnect()
+            base = min(base * 2, MAX_BACKOFF)
\ No newline at end of file
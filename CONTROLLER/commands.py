@@ -4,84 +4,87 @@ GOPRO_BASE_UUID = "B5F9{}-aa8d-11e3-9046-0002a5d5c51b"
 
 class Commands:
 	class Shutter:
-		Start = bytearray(b'\x03\x01\x01\x01')
-		Stop = bytearray(b'\x03\x01\x01\x00')
+		Start = b'\x03\x01\x01\x01'
+		Stop = b'\x03\x01\x01\x00'
 	class Mode:
-		Video = bytearray(b'\x03\x02\x01\x00')
-		Photo = bytearray(b'\x03\x02\x01\x01')
-		Multishot = bytearray(b'\x03\x02\x01\x02')
+		Video = b'\x03\x02\x01\x00'
+		Photo = b'\x03\x02\x01\x01'
+		Multishot = b'\x03\x02\x01\x02'
 	class Submode:
 		class Video:
-			Single =    bytearray(b'\x05\x03\x01\x00\x01\x00')
-			TimeLapse = bytearray(b'\x05\x03\x01\x00\x01\x01')
+			Single =    b'\x05\x03\x01\x00\x01\x00'
+			TimeLapse = b'\x05\x03\x01\x00\x01\x01'
 		class Photo:
-			Single = bytearray(b'\x05\x03\x01\x01\x01\x01')
-			Night = bytearray(b'\x05\x03\x01\x01\x01\x02')
+			Single = b'\x05\x03\x01\x01\x01\x01'
+			Night = b'\x05\x03\x01\x01\x01\x02'
 		class Multishot:
-			Burst =      bytearray(b'\x05\x03\x01\x02\x01\x00')
-			TimeLapse =  bytearray(b'\x05\x03\x01\x02\x01\x01')
-			NightLapse = bytearray(b'\x05\x03\x01\x02\x01\x02')
+			Burst =      b'\x05\x03\x01\x02\x01\x00'
+			TimeLapse =  b'\x05\x03\x01\x02\x01\x01'
+			NightLapse = b'\x05\x03\x01\x02\x01\x02'
 
 	class Basic:
-		Sleep = bytearray(b'\x01\x05')
-		PowerOffForce = bytearray(b'\x01\x04')
-		HiLightTag = bytearray(b'\x01\x18')
+		Sleep = b'\x01\x05'
+		PowerOffForce = b'\x01\x04'
+		HiLightTag = b'\x01\x18'
 	class Locate:
-		ON = bytearray(b'\x03\x16\x01\x01')
-		OFF = bytearray(b'\x03\x16\x01\x00')
+		ON = b'\x03\x16\x01\x01'
+		OFF = b'\x03\x16\x01\x00'
 	class WiFi:
-		ON = bytearray(b'\x03\x17\x01\x01')
-		OFF = bytearray(b'\x03\x17\x01\x00')
+		ON = b'\x03\x17\x01\x01'
+		OFF = b'\x03\x17\x01\x00'
 
 	# OpenGoPro commands
 	class Preset:
-		Activity = bytearray(b'\x06\x40\x04\x00\x00\x00\x01')
-		BurstPhoto = bytearray(b'\x06\x40\x04\x00\x01\x00\x02')
-		Cinematic = bytearray(b'\x06\x40\x04\x00\x00\x00\x02')
-		LiveBurst = bytearray(b'\x06\x40\x04\x00\x01\x00\x01')
-		NightPhoto = bytearray(b'\x06\x40\x04\x00\x01\x00\x03')
-		NightLapse = bytearray(b'\x06\x40\x04\x00\x02\x00\x02')
-		Photo = bytearray(b'\x06\x40\x04\x00\x01\x00\x00')
-		SloMo = bytearray(b'\x06\x40\x04\x00\x00\x00\x03')
-		Standard = bytearray(b'\x06\x40\x04\x00\x00\x00\x00')
-		TimeLapse = bytearray(b'\x06\x40\x04\x00\x02\x00\x01')
-		TimeWarp = bytearray(b'\x06\x40\x04\x00\x02\x00\x00')
-		MaxPhoto = bytearray(b'\x06\x40\x04\x00\x04\x00\x00')
-		MaxTimewarp = bytearray(b'\x06\x40\x04\x00\x05\x00\x00')
-		MaxVideo = bytearray(b'\x06\x40\x04\x00\x03\x00\x00')
+		Activity = b'\x06\x40\x04\x00\x00\x00\x01'
+		BurstPhoto = b'\x06\x40\x04\x00\x01\x00\x02'
+		Cinematic = b'\x06\x40\x04\x00\x00\x00\x02'
+		LiveBurst = b'\x06\x40\x04\x00\x01\x00\x01'
+		NightPhoto = b'\x06\x40\x04\x00\x01\x00\x03'
+		NightLapse = b'\x06\x40\x04\x00\x02\x00\x02'
+		Photo = b'\x06\x40\x04\x00\x01\x00\x00'
+		SloMo = b'\x06\x40\x04\x00\x00\x00\x03'
+		Standard = b'\x06\x40\x04\x00\x00\x00\x00'
+		TimeLapse = b'\x06\x40\x04\x00\x02\x00\x01'
+		TimeWarp = b'\x06\x40\x04\x00\x02\x00\x00'
+		MaxPhoto = b'\x06\x40\x04\x00\x04\x00\x00'
+		MaxTimewarp = b'\x06\x40\x04\x00\x05\x00\x00'
+		MaxVideo = b'\x06\x40\x04\x00\x03\x00\x00'
 	class PresetGroup:
-		Video = bytearray(b'\x04\x3E\x02\x03\xE8')
-		Photo = bytearray(b'\x04\x3E\x02\x03\xE9')
-		Timelapse = bytearray(b'\x04\x3E\x02\x03\xEA')
+		Video = b'\x04\x3E\x02\x03\xE8'
+		Photo = b'\x04\x3E\x02\x03\xE9'
+		Timelapse = b'\x04\x3E\x02\x03\xEA'
 	class Turbo:
-		ON = bytearray(b'\x04\xF1\x6B\x08\x01')
-		OFF = bytearray(b'\x04\xF1\x6B\x08\x00')
+		ON = b'\x04\xF1\x6B\x08\x01'
+		OFF = b'\x04\xF1\x6B\x08\x00'
 	class Analytics:
-		SetThirdPartyClient = bytearray(b'\x01\x50')
+		SetThirdPartyClient = b'\x01\x50'
 
 class Settings:
     class Resolution:
-        RES_1080p = bytearray(b'\x04\x02\x01\x09')
-        RES_2_7K = bytearray(b'\x04\x02\x01\x04')
-        RES_4K = bytearray(b'\x04\x02\x01\x01')
-        RES_5_3K = bytearray(b'\x04\x02\x01\x64')
+        RES_1080p = b'\x04\x02\x01\x09'
+        RES_2_7K = b'\x04\x02\x01\x04'
+        RES_4K = b'\x04\x02\x01\x01'
+        RES_5_3K = b'\x04\x02\x01\x64'
     class Framerate:
-        FPS_30 = bytearray(b'\x04\x03\x01\x08')
-        FPS_60 = bytearray(b'\x04\x03\x01\x05')
-        FPS_120 = bytearray(b'\x04\x03\x01\x01')
-        FPS_240 = bytearray(b'\x04\x03\x01\x00')
+        FPS_30 = b'\x04\x03\x01\x08'
+        FPS_60 = b'\x04\x03\x01\x05'
+        FPS_120 = b'\x04\x03\x01\x01'
+        FPS_240 = b'\x04\x03\x01\x00'
     class VideoLens:
-        Wide = bytearray(b'\x04\x79\x01\x00')
-        Narrow = bytearray(b'\x04\x79\x01\x02')
-        Superview = bytearray(b'\x04\x79\x01\x03')
-        Linear = bytearray(b'\x04\x79\x01\x04')
-        MaxSuperview = bytearray(b'\x04\x79\x01\x07')
-        LinearLevel = bytearray(b'\x04\x79\x01\x08')
+        Wide = b'\x04\x79\x01\x00'
+        Narrow = b'\x04\x79\x01\x02'
+        Superview = b'\x04\x79\x01\x03'
+        Linear = b'\x04\x79\x01\x04'
+        MaxSuperview = b'\x04\x79\x01\x07'
+        LinearLevel = b'\x04\x79\x01\x08'
     class AutoPowerDown:
-        Never = bytearray(b'\x04\x3b\x01\x00')
-        Minutes_5 = bytearray(b'\x04\x3b\x01\x04') 
-        Minutes_15 = bytearray(b'\x04\x3b\x01\x06')
-        Minutes_30 = bytearray(b'\x04\x3b\x01\x07') 
+        Never = b'\x04\x3b\x01\x00'
+        Minutes_5 = b'\x04\x3b\x01\x04' 
+        Minutes_15 = b'\x04\x3b\x01\x06'
+        Minutes_30 = b'\x04\x3b\x01\x07' 
+    class GPS:
+        OFF = b'\x04\x53\x01\x00'
+        ON = b'\x04\x53\x01\x01'
 
 class GoProUuid:
 	Control = BLE_CHAR_STRING.format("FEA6".lower())
@@ -42,6 +42,23 @@ INACTIVITY_TIMEOUT = 300
 COMMAND_DELAY = 0.5
 STATUS_QUERY_INTERVAL = 5
 DISPLAY_TIMEOUT = 30
+RECONNECT_TIMEOUT = 120  # Give up BLE reconnection (and reboot) after this long
+
+# === BLE Connection ===
+# Connection interval range requested from the GoPro (microseconds). Every command, setting and
+# query write waits for a connection event, so a shorter interval lowers latency at some power cost.
+BLE_MIN_CONN_INTERVAL_US = 15000
+BLE_MAX_CONN_INTERVAL_US = 30000
+
+# Scan timing (microseconds). Window == interval scans continuously (100% duty cycle), so a GoPro is
+# found in as few advertising cycles as possible. This is the highest-power setting: keep scans short.
+BLE_SCAN_INTERVAL_US = 40000
+BLE_SCAN_WINDOW_US = 40000
+
+# === GoPro Status Updates ===
+# Status IDs the GoPro pushes whenever they change (registered on every connection):
+# 0x0A encoding, 0x55 low temperature warning, 0x06 overheating warning
+STATUS_IDS = (0x0A, 0x55, 0x06)
 
 # === GPIO Pins ===
 BUTTON_PIN = 0
@@ -51,6 +68,8 @@ VEXT_CTRL_PIN = 36
 RST_OLED_PIN = 21
 I2C_SCL_PIN = 18
 I2C_SDA_PIN = 17
+I2C_ID = 0  # Hardware I2C peripheral driving the OLED
+I2C_FREQ = 400000  # SSD1306 fast-mode clock (Hz)
 
 OLED_WIDTH = 64
 OLED_HEIGHT = 32
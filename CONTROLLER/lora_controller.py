@@ -5,6 +5,14 @@ import struct
 import config
 from logger_utils import print_info, print_warning, print_error, print_debug
 
+HEADER_FMT = '>HHB'  # sender_id, receiver_id, payload_length
+HEADER_SIZE = 5  # struct.calcsize(HEADER_FMT)
+MAX_PACKET_SIZE = 255  # SX126x FIFO limit
+
+# Reused for every outgoing packet: the modem copies it into its FIFO before send() first yields
+_TX_BUF = bytearray(MAX_PACKET_SIZE)
+_TX_MV = memoryview(_TX_BUF)
+
 def get_async_modem():
     from lora import AsyncSX1262
 
@@ -23,32 +31,34 @@ def get_async_modem():
     )
 
 async def recv_coro(modem, local_id, handle_message):
-    """ LoRa receive function """
+    """ LoRa receive function
+
+    The payload passed to `handle_message` is a memoryview into the received packet,
+    not a copy; callers that keep it or need bytes methods should use bytes(payload).
+    """
     while True:
         rx = await modem.recv(800)  # Timeout reduced to 480 ms
 
         if rx:
 
-            if len(rx) < 5:
+            if len(rx) < HEADER_SIZE:
                 print_error("[LoRa] Error: Received packet is too short, skipping...")
 
                 continue
             
-            try:
-                sender_id, receiver_id, payload_length = struct.unpack('>HHB', rx[:5])
-            except struct.error:
-                print_error("[LoRa] Error: Failed to unpack the header, skipping...")
-                continue
+            # Unpack in place: no header slice is allocated
+            sender_id, receiver_id, payload_length = struct.unpack_from(HEADER_FMT, rx, 0)
 
             if receiver_id != local_id:
-                print_debug(f"[LoRa] Message not addressed to this device (Local ID: {local_id}). Skipping...")
+                if config.DEBUG_ENABLED:
+                    print_debug(f"[LoRa] Message not addressed to this device (Local ID: {local_id}). Skipping...")
                 continue
 
-            if len(rx) < 5 + payload_length:
-                print_error(f"[LoRa] Error: Incomplete payload. Expected {5 + payload_length} bytes, received {len(rx)} bytes.")
+            if len(rx) < HEADER_SIZE + payload_length:
+                print_error(f"[LoRa] Error: Incomplete payload. Expected {HEADER_SIZE + payload_length} bytes, received {len(rx)} bytes.")
                 continue
 
-            payload = rx[5:5 + payload_length]
+            payload = memoryview(rx)[HEADER_SIZE:HEADER_SIZE + payload_length]
 
             received_data = {
                 "sender_id": sender_id,
@@ -59,7 +69,8 @@ async def recv_coro(modem, local_id, handle_message):
                 "packet_length": len(rx),
             }
 
-            print_debug(f"[LoRa ID:{sender_id}] Received message {payload!r}, RSSI: {rx.rssi}, SNR: {rx.snr}, Length: {len(rx)}")
+            if config.DEBUG_ENABLED:
+                print_debug(f"[LoRa ID:{sender_id}] Received message {bytes(payload)!r}, RSSI: {rx.rssi}, SNR: {rx.snr}, Length: {len(rx)}")
 
             try:
                 handle_message(received_data)
@@ -69,24 +80,26 @@ async def recv_coro(modem, local_id, handle_message):
 async def send_coro(modem, local_id, receiver_id, payload):
     """ LoRa send function """
     payload_length = len(payload)
-    header = struct.pack('>HHB', local_id, receiver_id, payload_length)
+    if HEADER_SIZE + payload_length > MAX_PACKET_SIZE:
+        print_error(f"[LoRa] Error: Payload too long ({payload_length} bytes), not sending.")
+        return
 
-    full_message = bytearray(len(header) + len(payload))
-    full_message[:len(header)] = header
-    full_message[len(header):] = payload
+    # Header and payload are written straight into the shared TX buffer, no intermediate copies
+    struct.pack_into(HEADER_FMT, _TX_BUF, 0, local_id, receiver_id, payload_length)
+    _TX_BUF[HEADER_SIZE:HEADER_SIZE + payload_length] = payload
 
-    print_debug(f"[LoRa ID:{receiver_id}] Sending message: {payload}")
+    if config.DEBUG_ENABLED:
+        print_debug(f"[LoRa ID:{receiver_id}] Sending message: {payload}")
 
-    await modem.send(full_message)
+    await modem.send(_TX_MV[:HEADER_SIZE + payload_length])
 
 def handle_message(received_data):
     """ Handles received messages """
     sender_id = received_data["sender_id"]
     payload = received_data["payload"]
-    
-    if not isinstance(payload, (bytes, bytearray)):
-        print_error(f"[LoRa] Error: Payload is not in the expected format: {type(payload)}")
-        return
+
+    # recv_coro always passes a memoryview slice of the packet; checked only in debug builds
+    assert isinstance(payload, memoryview), type(payload)
 
 async def main():
     local_id = config.DEVICE_UID
@@ -9,16 +9,20 @@ from commands import Commands, Settings
 from ble_handler import register_callback
 from oled_display import update_display, shutdown_display
 from lora_controller import get_async_modem, send_coro, recv_coro
-import urandom
+from micropython import const
 
 # GPIO setup
 button_pin = machine.Pin(config.BUTTON_PIN, machine.Pin.IN, machine.Pin.PULL_UP)
+button_flag = asyncio.ThreadSafeFlag()  # Set from the button IRQ on each falling edge
+button_pin.irq(trigger=machine.Pin.IRQ_FALLING, handler=lambda pin: button_flag.set())
+
+BUTTON_DEBOUNCE_MS = 20  # Settle time before confirming a press
 
 ble = GoProBLE()
 
 # Global variables for status tracking
 modem = None
-last_interaction = time.time()  # Track last button press or command
+last_interaction = time.ticks_ms()  # Track last button press or command (ticks_ms)
 
 camera_status = {
     "recording": False,
@@ -27,35 +31,54 @@ camera_status = {
     "camera_on": True,
     "internal_battery_percentage": 0,
 }
-
-# LoRa Commands
-LORA_COMMANDS = {
-    "START": 0x01,
-    "STOP": 0x02,
-    "TRIGGER": 0x03,
-    # add more later
-}
-
-async def monitor_inactivity():
-    """
-    Stops queries and powers off the camera after a period of user inactivity.
-    
-    Checks the last interaction timestamp and sends a sleep command to the camera
-    if the inactivity threshold is exceeded.
-    """
-    while True:
-        if not camera_status["camera_on"] or config.ALWAYS_ON:
-            await asyncio.sleep(1)  # Sleep if the camera is off or alway-on is enabled
-            continue  # Skip loop iteration
-
-        await asyncio.sleep(10)  # Check every 10 seconds
-        elapsed_time = time.time() - last_interaction
-        print_debug(f"Checking inactivity: Elapsed time = {elapsed_time:.2f} seconds")
-
-        if camera_status["camera_on"] and elapsed_time > config.INACTIVITY_TIMEOUT:  # Use the constant for inactivity timeout
-            print_debug(f"No interaction for {config.INACTIVITY_TIMEOUT} seconds. Stopping queries and powering off GoPro...")
-            camera_status["camera_on"] = False
-            await ble.send_command(Commands.Basic.Sleep)  # Power off the GoPro
+camera_on_event = asyncio.Event()  # Set while camera_status["camera_on"] is True
+camera_on_event.set()
+
+# LoRa Commands (add more later)
+_CMD_START = const(0x01)
+_CMD_STOP = const(0x02)
+_CMD_TRIGGER = const(0x03)
+
+# Inactivity timeout in ms, compared against ticks_diff() of last_interaction
+_INACTIVITY_TIMEOUT_MS = config.INACTIVITY_TIMEOUT * 1000
+
+# Upper bound on waiting for each setup command's response
+_ACK_TIMEOUT_MS = int(config.COMMAND_DELAY * 1000)
+
+# setup_camera steps: (is_setting, payload, display label), applied in order
+_SETUP_STEPS = (
+    (False, Commands.WiFi.OFF, "WiFi off"),
+    (True, Settings.GPS.ON, "GPS on"),
+    (True, Settings.AutoPowerDown.Never, "PwrSave"),
+    (False, Commands.PresetGroup.Video, "Mode"),
+    (True, config.RESOLUTION, "Res"),
+    (True, config.FRAMERATE, "FPS"),
+    (True, config.FOV, "FOV"),
+)
+
+# Periodic status query: length, Get Status Values (0x13), then the status IDs
+_QUERY_BYTES = b'\x09\x13\x0a\x55\x06\x02\x01\x46\x27'
+
+# Per-device heartbeat phase offset (0-1023 ms) derived from the UID, so controllers
+# sharing the channel transmit in distinct slots instead of colliding at random
+_TX_SLOT_MS = (config.DEVICE_UID * 37) & 0x3FF
+_HEARTBEAT_INTERVAL_MS = config.STATUS_QUERY_INTERVAL * 1000
+
+# Heartbeat payload, reused on every send (only the status fields change)
+_HB_BUF = bytearray(
+    b'\x10'        # Heartbeat message type
+    b'\x00'        # camera_connected
+    b'\x00'        # GoPro battery_level
+    b'\x00'        # sleep_mode
+    b'\x00'        # overheating
+    b'\x00'        # low_temperature
+    b'\x00'        # flatmode
+    b'\x00'        # preset_group
+    b'\x00'        # video_preset
+    b'\x00'        # framerate
+    b'\x00'        # resolution
+    b'\x00'        # recording
+)
 
 async def delayed_display_off(delay=config.DISPLAY_TIMEOUT):
     """
@@ -76,35 +99,49 @@ async def handle_button_press():
     - If the camera is ON, a button press toggles recording (start/stop).
     - If the camera is OFF, a button press wakes it up and reinitializes tracking.
 
-    Continuously polls the button pin and manages debounce timing.
+    Waits on `button_flag`, which the falling-edge IRQ on the button pin sets,
+    then confirms the press after a short debounce delay.
 
     Globals Modified:
         camera_status["recording"] (bool): Updated based on command sent.
         camera_status["camera_on"] (bool): Set to True if the camera is woken up.
-        last_interaction (float): Updated with the current time on press.
+        last_interaction (int): Updated with `time.ticks_ms()` on press.
     """
     global last_interaction
+
+    # Bind globals and attributes used every press to locals (slot access, no dict lookup)
+    status = camera_status
+    flag = button_flag
+    pin_value = button_pin.value
+    send_command = ble.send_command
+    sleep = asyncio.sleep
+    ticks_ms = time.ticks_ms
     
     while True:
-        if not button_pin.value():  
-            last_interaction = time.time()  # Update interaction time
-
-            if camera_status["camera_on"]:
-                # If camera is on, toggle recording
-                if camera_status["recording"]:
-                    await ble.send_command(Commands.Shutter.Stop)
-                    print_info("Button pressed: Sent Stop command")
-                else:
-                    await ble.send_command(Commands.Shutter.Start)
-                    print_info("Button pressed: Sent Start command")
+        await flag.wait()
+        await asyncio.sleep_ms(BUTTON_DEBOUNCE_MS)
+        if pin_value():
+            continue  # Bounce or released too quickly: not a press
+
+        last_interaction = ticks_ms()  # Update interaction time
+
+        if status["camera_on"]:
+            # If camera is on, toggle recording
+            if status["recording"]:
+                await send_command(Commands.Shutter.Stop)
+                print_info("Button pressed: Sent Stop command")
             else:
-                # If camera is off, wake it up and restart periodic queries
-                print_info("Button pressed: Waking up GoPro...")
-                await asyncio.sleep(2)  # Wait for camera to wake up
-                camera_status["camera_on"] = True
+                await send_command(Commands.Shutter.Start)
+                print_info("Button pressed: Sent Start command")
+        else:
+            # If camera is off, wake it up and restart periodic queries
+            print_info("Button pressed: Waking up GoPro...")
+            await sleep(2)  # Wait for camera to wake up
+            status["camera_on"] = True
+            camera_on_event.set()
 
-            await asyncio.sleep(0.2)  
-        await asyncio.sleep(0.05)
+        await sleep(0.2)
+        flag.clear()  # Drop edges raised while the press was handled
 
 def lora_handler_wrapper(received_data):
     """
@@ -126,8 +163,9 @@ async def periodic_heartbeat_sender():
     temperature flags, and recording status. If the camera is off, default
     safe values are sent instead.
 
-    Adds a small random delay before each transmission to help avoid
-    collisions with other LoRa devices.
+    The first transmission is delayed by a per-device slot offset
+    (`_TX_SLOT_MS`) and later ones follow a fixed cadence, so devices with
+    different UIDs keep distinct transmit phases instead of colliding.
 
     Globals Used:
         camera_status["camera_on"] (bool): Indicates if the camera is currently powered on.
@@ -139,134 +177,186 @@ async def periodic_heartbeat_sender():
     Notes:
         - Uses `config.STATUS_QUERY_INTERVAL` as the interval between messages.
         - Payload format is fixed and aligned with expected remote parsing.
+        - The payload lives in the module-level `_HB_BUF` and only the changing
+          fields are rewritten, so a heartbeat tick does not allocate.
+        - The emoji status summary is only built when `config.DEBUG_ENABLED` is set;
+          otherwise the payload is logged as a single hex string.
     """
+    # Bind globals and attributes used every tick to locals (slot access, no dict lookup)
+    status = camera_status
+    buf = _HB_BUF
+    radio = modem
+    src_uid = config.DEVICE_UID
+    dst_uid = config.REMOTE_UID
+    debug = config.DEBUG_ENABLED
+    sleep_ms = asyncio.sleep_ms
+    ticks_ms = time.ticks_ms
+    ticks_add = time.ticks_add
+    ticks_diff = time.ticks_diff
+
+    await sleep_ms(_TX_SLOT_MS)  # Phase offset for this device's slot
+    next_send = ticks_ms()
+
     while True:
-        msg_type = 0x10
-        
+        on = status["camera_on"]
+
         # If camera is off, override statuses to safe defaults
-        hot = int(camera_status["system_hot"]) if camera_status["camera_on"] else 0
-        cold = int(camera_status["low_temp"]) if camera_status["camera_on"] else 0
-        recording = int(camera_status["recording"]) if camera_status["camera_on"] else 0
-
-        payload = bytearray([
-            msg_type,											# Heartbeat message type
-            int(camera_status["camera_on"]),					# camera_connected
-            int(camera_status["internal_battery_percentage"]),	# GoPro battery_level
-            int(camera_status["camera_on"]),					# sleep_mode
-            hot,												# overheating
-            cold,												# low_temperature
-            0,													# flatmode
-            0,													# preset_group
-            0,													# video_preset
-            0,													# framerate
-            0,  												# resolution
-            recording											# recording
-        ])
-
-        recording_icon = "🔴" if camera_status["recording"] else "⚪"
-        hot_icon = "🔥" if camera_status["system_hot"] else "✅"
-        cold_icon = "❄️" if camera_status["low_temp"] else "✅"
-        power_icon = "✅" if camera_status["camera_on"] else "💤"
-        battery_pct = camera_status["internal_battery_percentage"]
-        battery_icon = "🟥" if battery_pct <= 20 else "🟨" if battery_pct <= 50 else "🟩"
-
-        print_info(
-            f"[Heartbeat] {power_icon} CAMERA: {'On' if camera_status['camera_on'] else 'Off'} | "
-            f"{hot_icon} HOT: {'Yes' if camera_status['system_hot'] else 'No'} | "
-            f"{cold_icon} COLD: {'Yes' if camera_status['low_temp'] else 'No'} | "
-            f"{recording_icon} RECORDING: {'Yes' if camera_status['recording'] else 'No'} | "
-            f"🔋 BATTERY: {battery_icon} {battery_pct}%"
-        )
-        
-        # Add randorm delay to avoir LoRa Collistions
-        await asyncio.sleep_ms(urandom.getrandbits(4))  # Random 0–15 ms
+        buf[1] = on
+        buf[2] = status["internal_battery_percentage"]
+        buf[3] = on
+        buf[4] = status["system_hot"] if on else 0
+        buf[5] = status["low_temp"] if on else 0
+        buf[11] = status["recording"] if on else 0
+
+        if debug:
+            recording_icon = "🔴" if status["recording"] else "⚪"
+            hot_icon = "🔥" if status["system_hot"] else "✅"
+            cold_icon = "❄️" if status["low_temp"] else "✅"
+            power_icon = "✅" if on else "💤"
+            battery_pct = status["internal_battery_percentage"]
+            battery_icon = "🟥" if battery_pct <= 20 else "🟨" if battery_pct <= 50 else "🟩"
+
+            print_info(
+                f"[Heartbeat] {power_icon} CAMERA: {'On' if on else 'Off'} | "
+                f"{hot_icon} HOT: {'Yes' if status['system_hot'] else 'No'} | "
+                f"{cold_icon} COLD: {'Yes' if status['low_temp'] else 'No'} | "
+                f"{recording_icon} RECORDING: {'Yes' if status['recording'] else 'No'} | "
+                f"🔋 BATTERY: {battery_icon} {battery_pct}%"
+            )
+        else:
+            print_info(f"[Heartbeat] {buf.hex()}")  # Compact, machine-parseable payload dump
         
         # Send heartbeat to the remote vie LoRa
-        await send_coro(modem, config.DEVICE_UID, config.REMOTE_UID, payload)
+        await send_coro(radio, src_uid, dst_uid, buf)
         
-        # Wait for the next send as defined in config.py
-        await asyncio.sleep(config.STATUS_QUERY_INTERVAL)  # send every 5s or whatever you want
+        # Wait for the next slot as defined in config.py, measured from the previous
+        # slot so the time spent sending does not shift the phase
+        next_send = ticks_add(next_send, _HEARTBEAT_INTERVAL_MS)
+        await sleep_ms(max(0, ticks_diff(next_send, ticks_ms())))
 
 async def setup_camera():
     """
     Configures the GoPro with default recording parameters on startup.
 
-    Sends a series of BLE commands to apply camera settings such as:
+    Sends the BLE commands listed in `_SETUP_STEPS` to apply camera settings such as:
     - Disabling WiFi
     - Enabling GPS
     - Disabling auto power-down
     - Selecting video mode preset
     - Applying resolution, framerate, and FOV from config
 
-    A delay (`config.COMMAND_DELAY`) is applied between each command to ensure
-    the camera has time to process and apply the settings correctly.
+    Each command waits for the camera's response before the next one is sent,
+    with `config.COMMAND_DELAY` as the upper bound if no response arrives.
 
-    The OLED display is updated after each step for user feedback.
+    The OLED display shows the step number and setting as each step runs.
     """
-    print_debug("Disabling WiFi...")
-    await ble.send_command(Commands.WiFi.OFF)
-    update_display("Disabling", "WiFi")
-    await asyncio.sleep(config.COMMAND_DELAY)
-    
-    print_debug("Enabling GPS...")
-    await ble.send_settings_request(Settings.GPS.ON)
-    update_display("Enabling", "GPS")
-    await asyncio.sleep(config.COMMAND_DELAY)
-    
-    print_debug("Disabling Auto Power Down...")
-    update_display("Disabling", "PowerSave")
-    await ble.send_settings_request(Settings.AutoPowerDown.Never)
-    await asyncio.sleep(config.COMMAND_DELAY)
-    
-    print_debug("Setting Video Mode...")
-    update_display("Setting", "Mode")
-    await ble.send_command(Commands.PresetGroup.Video)
-    await asyncio.sleep(config.COMMAND_DELAY)
-    
-    print_debug("Setting Resolution...")
-    update_display("Setting", "Resolution")
-    await ble.send_settings_request(config.RESOLUTION)
-    await asyncio.sleep(config.COMMAND_DELAY)
-    
-    print_debug("Setting Framerate...")
-    update_display("Setting", "FPS")
-    await ble.send_settings_request(config.FRAMERATE)
-    await asyncio.sleep(config.COMMAND_DELAY)
-    
-    print_debug("Setting FOV...")
-    update_display("Setting", "FOV")
-    await ble.send_settings_request(config.FOV)
-    await asyncio.sleep(config.COMMAND_DELAY)
+    total = len(_SETUP_STEPS)
+    for step, (is_setting, payload, label) in enumerate(_SETUP_STEPS, 1):
+        if config.DEBUG_ENABLED:
+            print_debug(f"Setup step {step}/{total}: {label}")
+        update_display(f"{step}/{total}", label)
+        if is_setting:
+            await ble.send_settings_and_wait(payload, _ACK_TIMEOUT_MS)
+        else:
+            await ble.send_command_and_wait(payload, _ACK_TIMEOUT_MS)
     
     update_display(f"ID: {config.DEVICE_UID}", "READY")
     
 async def periodic_query_request():
     """
-    Periodically sends a BLE query request to update camera status.
+    Periodically sends a BLE query request to update camera status, and powers
+    off the camera after a period of user inactivity.
 
-    This coroutine checks if the camera is on and, if so, sends a status
-    query at regular intervals defined by `config.STATUS_QUERY_INTERVAL`.
-    If the camera is off, it waits and checks again every second.
+    This coroutine waits on `camera_on_event` and, while the camera is on,
+    wakes at regular intervals defined by `config.STATUS_QUERY_INTERVAL`.
+    On each wakeup it first checks the last interaction timestamp: past
+    `config.INACTIVITY_TIMEOUT` (and unless `config.ALWAYS_ON` is set) it sends
+    a sleep command to the camera, otherwise it sends a status query.
+    While the camera is off it stays blocked on the event instead of polling.
+
+    Globals Modified:
+        camera_status["camera_on"] (bool): Set to False when the camera is powered off.
 
     Notes:
         - The query is used to retrieve current camera state (e.g., recording, temperature).
-        - Query bytes are currently hardcoded and may be updated as needed.
+        - Query bytes are held in the module-level `_QUERY_BYTES` constant.
+        - Inactivity is checked once per query interval.
     """
+    # Bind globals and attributes used every wakeup to locals (slot access, no dict lookup)
+    status = camera_status
+    event = camera_on_event
+    always_on = config.ALWAYS_ON
+    debug = config.DEBUG_ENABLED
+    interval = config.STATUS_QUERY_INTERVAL
+    send_query = ble.send_query_request
+    ticks_ms = time.ticks_ms
+    ticks_diff = time.ticks_diff
+
     while True:
-        if camera_status["camera_on"]:
-            # await ble.send_query_request(b'\x05\x13\x0a\x55\x06')
-            await ble.send_query_request(b'\x09\x13\x0a\x55\x06\x02\x01\x46\x27')
-            await asyncio.sleep(config.STATUS_QUERY_INTERVAL)
-        else:
-            print_debug("Camera is off, waiting...")
-            await asyncio.sleep(1)  # Poll every second until camera is on
+        await event.wait()
+
+        if not always_on:
+            elapsed_ms = ticks_diff(ticks_ms(), last_interaction)
+            if debug:
+                print_debug(f"Checking inactivity: Elapsed time = {elapsed_ms // 1000} seconds")
+
+            if elapsed_ms > _INACTIVITY_TIMEOUT_MS:  # Use the constant for inactivity timeout
+                print_debug(f"No interaction for {config.INACTIVITY_TIMEOUT} seconds. Stopping queries and powering off GoPro...")
+                status["camera_on"] = False
+                event.clear()
+                await ble.send_command(Commands.Basic.Sleep)  # Power off the GoPro
+                continue
+
+        await send_query(_QUERY_BYTES)
+        await asyncio.sleep(interval)
             
+async def _do_start():
+    """Starts recording on the GoPro (LoRa START command)."""
+    print_info("Sending START recording command to GoPro...")
+    await ble.send_command(Commands.Shutter.Start)
+
+async def _do_stop():
+    """Stops recording on the GoPro (LoRa STOP command)."""
+    print_info("Sending STOP recording command to GoPro...")
+    await ble.send_command(Commands.Shutter.Stop)
+
+async def _do_trigger():
+    """
+    Toggles recording on the GoPro (LoRa TRIGGER command).
+
+    If the camera is off, reconnects to it instead and skips the toggle.
+    """
+    if not camera_status["camera_on"]:
+        print_info("Received TRIGGER command but GoPro is off: reconnecting...")
+        if await ble.reconnect():
+            camera_status["camera_on"] = True
+            camera_on_event.set()
+            print_debug("GoPro is ON again.")
+        else:
+            print_error("Reconnect to GoPro failed. Skipping command.")
+        return  # Still skip executing the command itself
+
+    if camera_status["recording"]:
+        print_info("GoPro is recording: sending STOP recording command...")
+        await ble.send_command(Commands.Shutter.Stop)
+    else:
+        print_info("GoPro is NOT recording: sending START recording command...")
+        await ble.send_command(Commands.Shutter.Start)
+
+# LoRa command code -> handler coroutine
+_DISPATCH = {
+    _CMD_START: _do_start,
+    _CMD_STOP: _do_stop,
+    _CMD_TRIGGER: _do_trigger,
+}
+
 async def process_received_message(received_data):
     """
     Handles incoming LoRa command messages and controls the GoPro accordingly.
 
     Parses the received payload to extract a single-byte command, then
-    performs the appropriate camera action (start, stop, or trigger recording).
+    looks up its handler in `_DISPATCH` to perform the appropriate camera
+    action (start, stop, or trigger recording).
 
     Behavior:
         - If the camera is off and a TRIGGER command is received,
@@ -279,7 +369,7 @@ async def process_received_message(received_data):
 
     Globals Used:
         camera_status["camera_on"] (bool): Checked and modified based on command logic.
-        last_interaction (float): Updated to track user interaction time.
+        last_interaction (int): Updated with `time.ticks_ms()` to track user interaction time.
 
     Logs:
         - Payload content and command details
@@ -300,40 +390,13 @@ async def process_received_message(received_data):
         print_error(f"Unexpected payload length: {len(rx_bytes)}. Expected 1 byte.")
         return
 
-    command_code = rx_bytes[0]  # Extract the integer command code
-
-    # If camera off, reconnect
-    if not camera_status["camera_on"]:
-        if command_code == LORA_COMMANDS["TRIGGER"]:
-            last_interaction = time.time()  # Update interaction time
-            print_info("Received TRIGGER command but GoPro is off: reconnecting...")
-            success = await ble.reconnect()
-            if success:
-                camera_status["camera_on"] = True
-                print_debug("GoPro is ON again.")
-            else:
-                print_error("Reconnect to GoPro failed. Skipping command.")
-            return  # Still skip executing the command itself
-
-    # Camera is on, handle commands normally
-    if command_code == LORA_COMMANDS["START"]:
-        last_interaction = time.time()
-        print_info("Sending START recording command to GoPro...")
-        await ble.send_command(Commands.Shutter.Start)
-    elif command_code == LORA_COMMANDS["STOP"]:
-        last_interaction = time.time()
-        print_info("Sending STOP recording command to GoPro...")
-        await ble.send_command(Commands.Shutter.Stop)
-    elif command_code == LORA_COMMANDS["TRIGGER"]:
-        last_interaction = time.time()
-        if camera_status["recording"]:
-            print_info("GoPro is recording: sending STOP recording command...")
-            await ble.send_command(Commands.Shutter.Stop)
-        else:
-            print_info("GoPro is NOT recording: sending START recording command...")
-            await ble.send_command(Commands.Shutter.Start)
-    else:
+    handler = _DISPATCH.get(rx_bytes[0])
+    if handler is None:
         print_error(f"Unknown command: {rx_bytes}")
+        return
+
+    last_interaction = time.ticks_ms()  # Update interaction time
+    await handler()
         
 async def ble_notification_data_handler(event_type, data):
     """
@@ -354,6 +417,7 @@ async def ble_notification_data_handler(event_type, data):
         camera_status["internal_battery_percentage"] (int): Updated based on query responses.
     """
     print_info(f"Received event {event_type} with data: {data}")
+    ble.acknowledge(event_type, data)
 
     # Update global variables based on event_type and data, e.g.:
     if event_type == "query_response":
@@ -391,7 +455,7 @@ async def main():
     print_info("Starting button monitor...")
     asyncio.create_task(handle_button_press())
     
-    # Start periodic query requests
+    # Start periodic query requests (also runs the inactivity check)
     print_info("Starting periodic query requests...")
     asyncio.create_task(periodic_query_request())
     
@@ -399,15 +463,11 @@ async def main():
     print_info("Starting periodic heartbeat send...")
     asyncio.create_task(periodic_heartbeat_sender())
     
-    # Start inactivity monitor
-    print_info("Starting inactivity monitor...")
-    asyncio.create_task(monitor_inactivity())
-    
     # Start LoRa receiver
     print("Starting LoRa message receiver...")
     asyncio.create_task(recv_coro(modem, config.DEVICE_UID, lora_handler_wrapper))
     
-    while True:
-        await asyncio.sleep(1)
+    # Park the main task without a timer; the work runs in the tasks created above
+    await asyncio.Event().wait()
 
 asyncio.run(main())
\ No newline at end of file
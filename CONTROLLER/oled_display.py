@@ -1,6 +1,6 @@
 # L.A.U.R.A. CONTROLLER Ver.2 - oled_display.py
 import config
-from machine import Pin, SoftI2C
+from machine import Pin, I2C
 import ssd1306
 import utime as time
 
@@ -9,6 +9,7 @@ VEXT_CTRL = None
 RST_OLED = None
 i2c = None
 display = None
+_last_rows = None  # Rows currently shown, to skip redundant (slow, blocking) I2C redraws
 
 def init_display_hardware():
     global VEXT_CTRL, RST_OLED, i2c, display, display_power
@@ -27,21 +28,27 @@ def init_display_hardware():
     RST_OLED.off()
     RST_OLED.on()
 
-    i2c = SoftI2C(scl=Pin(config.I2C_SCL_PIN), sda=Pin(config.I2C_SDA_PIN))
+    i2c = I2C(config.I2C_ID, scl=Pin(config.I2C_SCL_PIN), sda=Pin(config.I2C_SDA_PIN), freq=config.I2C_FREQ)
     display = ssd1306.SSD1306_I2C(config.OLED_WIDTH, config.OLED_HEIGHT, i2c)
 
     display_power = True
 
 def update_display(row1, row2):
+    global _last_rows
     if not display_power:
         return
+    # A full redraw over I2C blocks the event loop, so skip it when nothing changed
+    if _last_rows == (row1, row2):
+        return
+    _last_rows = (row1, row2)
     display.fill(0)
     display.text(row1, 0, 6)
     display.text(row2, 0, 20)
     display.show()
 
 def shutdown_display():
-    global display_power, VEXT_CTRL, RST_OLED, i2c, display
+    global display_power, VEXT_CTRL, RST_OLED, i2c, display, _last_rows
+    _last_rows = None
     if display_power and VEXT_CTRL is not None:
         if display is not None:
             display.fill(0)
@@ -2,6 +2,7 @@
 import machine
 from machine import Pin, ADC
 import time
+import uasyncio as asyncio
 
 # Define GPIO Pins
 VBAT_Read = 1  # GPIO1 for ADC Battery Read (change if needed)
@@ -17,45 +18,66 @@ measuredVoltage = 4.16
 reportedVoltage = 3.9
 factor = (adcMaxVoltage / adcMax) * ((R1 + R2) / float(R2)) * (measuredVoltage / reportedVoltage)
 
+# Battery Percentage Constants
+max_voltage = 4.16  # Fully charged voltage
+min_voltage = 3.0  # Discharged voltage
+_INV_RANGE = 100.0 / (max_voltage - min_voltage)  # Percent per volt
+
+# Noise Filtering
+ADC_SAMPLES = 8  # Samples averaged per read
+_SAMPLE_FACTOR = factor / ADC_SAMPLES
+
 # Initialize ADC
 battery_adc = machine.ADC(machine.Pin(VBAT_Read))
 battery_adc.atten(machine.ADC.ATTN_11DB)  # Set attenuation for up to 3.6V
 
-# Initialize Control Pin
-adc_ctrl = machine.Pin(ADC_Ctrl, machine.Pin.OUT) if ADC_Ctrl else None
+# Initialize Control Pin, held HIGH for good (V3.2 module keeps the divider enabled)
+adc_ctrl = machine.Pin(ADC_Ctrl, machine.Pin.OUT, value=1) if ADC_Ctrl else None
+ADC_SETTLE_MS = 100  # Divider settle time, only needed before the first read
+_adc_settled = adc_ctrl is None
+
+def _read_voltage():
+    """Reads the battery voltage, averaged over ADC_SAMPLES."""
+    global _adc_settled
+    _adc_settled = True
+    read = battery_adc.read
+    total = 0
+    for _ in range(ADC_SAMPLES):
+        total += read()
+    return total * _SAMPLE_FACTOR
 
 def battery_voltage():
     """Reads the battery voltage and returns it as a float."""
-    if adc_ctrl:
-        adc_ctrl.value(1)  # Enable ADC by setting it HIGH
-        time.sleep_ms(100)  # Delay for stability
-
-    # Read the ADC value and calculate voltage
-    analog_value = battery_adc.read()
-    float_voltage = factor * analog_value
-    
-    if adc_ctrl:
-        adc_ctrl.value(1)  # Disable ADC if needed (keep it HIGH as per the V3.2 module)
-
-    # Return the battery voltage as a float
-    return float_voltage
+    if not _adc_settled:
+        time.sleep_ms(ADC_SETTLE_MS)  # Delay for stability, first read only
+    return _read_voltage()
 
-def battery_percentage():
-    """Reads the battery voltage and returns the percentage as an integer."""
-    voltage = battery_voltage()  # Get the battery voltage
+async def battery_voltage_async():
+    """Reads the battery voltage without blocking the event loop and returns it as a float."""
+    if not _adc_settled:
+        await asyncio.sleep_ms(ADC_SETTLE_MS)  # Delay for stability, first read only
+    return _read_voltage()
 
+def _voltage_to_percentage(voltage):
+    """Converts a battery voltage to a percentage as an integer."""
     # Calculate battery percentage
-    max_voltage = 4.16  # Fully charged voltage
-    min_voltage = 3.0  # Discharged voltage
-    battery_percentage = max(0, min(100, ((voltage - min_voltage) / (max_voltage - min_voltage)) * 100))  # Ensure percentage stays between 0 and 100
+    battery_percentage = max(0, min(100, (voltage - min_voltage) * _INV_RANGE))  # Ensure percentage stays between 0 and 100
     
     # Return the battery percentage as an integer
     return int(battery_percentage)
 
+def battery_percentage():
+    """Reads the battery voltage and returns the percentage as an integer."""
+    return _voltage_to_percentage(battery_voltage())
+
+async def battery_percentage_async():
+    """Reads the battery voltage without blocking and returns the percentage as an integer."""
+    return _voltage_to_percentage(await battery_voltage_async())
+
 def main():
     while True:
         voltage = battery_voltage()  # Get the battery voltage
-        percentage = battery_percentage()  # Get the battery percentage
+        percentage = _voltage_to_percentage(voltage)  # Percentage of the same reading
         print(f"Voltage: {voltage:.3f} V, Battery Percentage: {percentage}%")
         time.sleep(5)
 
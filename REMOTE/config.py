@@ -15,6 +15,8 @@ VEXT_CTRL_PIN = 36
 RST_OLED_PIN = 21
 I2C_SCL_PIN = 18
 I2C_SDA_PIN = 17
+I2C_ID = 0  # Hardware I2C peripheral driving the OLED
+I2C_FREQ = 400000  # SSD1306 fast-mode clock (Hz)
 
 OLED_WIDTH = 128
 OLED_HEIGHT = 64
@@ -1,18 +1,20 @@
 # L.A.U.R.A. REMOTE Ver.2.1 - display_controller.py
 import utime as time
 import uasyncio as asyncio
-from machine import Pin, SoftI2C
+from machine import Pin, I2C
 import ssd1306
-from config import VEXT_CTRL_PIN, RST_OLED_PIN, I2C_SCL_PIN, I2C_SDA_PIN, OLED_WIDTH, OLED_HEIGHT 
+import framebuf
+from micropython import const
+from config import VEXT_CTRL_PIN, RST_OLED_PIN, I2C_SCL_PIN, I2C_SDA_PIN, I2C_ID, I2C_FREQ, OLED_WIDTH, OLED_HEIGHT
 from logger_utils import print_info, print_warning, print_error, print_debug
 
 # Adjustable blink settings
-BLINK_COUNT = 2
-BLINK_INTERVAL_MS = 200
+BLINK_COUNT = const(2)
+BLINK_INTERVAL_MS = const(200)
 
 # Define lines position
-LINE_HEIGHT = 12
-LINE_SPACING = 12
+LINE_HEIGHT = const(12)
+LINE_SPACING = const(12)
 
 # Heart Matrix (8x8)
 heart_matrix = [
@@ -25,6 +27,106 @@ heart_matrix = [
     [0, 0, 0, 0, 0, 0, 0, 0],
     [0, 0, 0, 0, 0, 0, 0, 0]
 ]
+HEART_SIZE = const(8)
+
+# Heart packed once into a MONO_VLSB bitmap (one byte per column, bit n = row n) so it can be blitted
+HEART_FB = framebuf.FrameBuffer(
+    bytearray(sum(heart_matrix[y][x] << y for y in range(HEART_SIZE)) for x in range(HEART_SIZE)),
+    HEART_SIZE, HEART_SIZE, framebuf.MONO_VLSB)
+
+# Partial refresh: flush only the changed area unless it covers more than this share of the screen
+FULL_REFRESH_RATIO = 0.75
+
+# SSD1306 addressing commands used to select the flush window
+SET_COL_ADDR = const(0x21)
+SET_PAGE_ADDR = const(0x22)
+
+# SSD1306 driver that records the area touched by drawing calls so fast_show() only
+# sends that window over I2C instead of the whole framebuffer
+class PartialSSD1306(ssd1306.SSD1306_I2C):
+    def __init__(self, width, height, i2c, addr=0x3C, external_vcc=False):
+        self._dirty = None  # [x0, y0, x1, y1] inclusive bounds of changed pixels, None if clean
+        super().__init__(width, height, i2c, addr, external_vcc)
+        self._buffer_mv = memoryview(self.buffer)
+
+    # Grow the dirty bounds to include the given rectangle (clipped to the screen)
+    def mark_dirty(self, x, y, w, h):
+        x0 = max(x, 0)
+        y0 = max(y, 0)
+        x1 = min(x + w, self.width) - 1
+        y1 = min(y + h, self.height) - 1
+        if x0 > x1 or y0 > y1:
+            return
+        d = self._dirty
+        if d is None:
+            self._dirty = [x0, y0, x1, y1]
+            return
+        if x0 < d[0]:
+            d[0] = x0
+        if y0 < d[1]:
+            d[1] = y0
+        if x1 > d[2]:
+            d[2] = x1
+        if y1 > d[3]:
+            d[3] = y1
+
+    def fill(self, c):
+        self.mark_dirty(0, 0, self.width, self.height)
+        super().fill(c)
+
+    def pixel(self, x, y, c=None):
+        if c is None:
+            return super().pixel(x, y)  # Read only, nothing changes
+        self.mark_dirty(x, y, 1, 1)
+        super().pixel(x, y, c)
+
+    def hline(self, x, y, w, c):
+        self.mark_dirty(x, y, w, 1)
+        super().hline(x, y, w, c)
+
+    def vline(self, x, y, h, c):
+        self.mark_dirty(x, y, 1, h)
+        super().vline(x, y, h, c)
+
+    def rect(self, x, y, w, h, c, *args):
+        self.mark_dirty(x, y, w, h)
+        super().rect(x, y, w, h, c, *args)
+
+    def fill_rect(self, x, y, w, h, c):
+        self.mark_dirty(x, y, w, h)
+        super().fill_rect(x, y, w, h, c)
+
+    def text(self, s, x, y, c=1):
+        self.mark_dirty(x, y, len(s) * 8, 8)  # Built-in font is 8x8
+        super().text(s, x, y, c)
+
+    def show(self):
+        self._dirty = None
+        super().show()
+
+    # Send only the dirty pages (the SSD1306 addresses 8-pixel rows); full-width pages are
+    # contiguous in the framebuffer, so they go out as one slice with no copy
+    def fast_show(self):
+        d = self._dirty
+        if d is None:
+            return  # Nothing changed since the last flush
+        page0 = d[1] >> 3
+        page1 = d[3] >> 3
+        if page1 - page0 + 1 > FULL_REFRESH_RATIO * self.pages:
+            self.show()  # Mostly dirty: a full frame costs about the same
+            return
+        self._dirty = None
+
+        col_offset = (128 - self.width) // 2  # Narrow displays use centred columns
+        self.write_cmd(SET_COL_ADDR)
+        self.write_cmd(col_offset)
+        self.write_cmd(col_offset + self.width - 1)
+        self.write_cmd(SET_PAGE_ADDR)
+        self.write_cmd(page0)
+        self.write_cmd(page1)
+
+        width = self.width
+        self.i2c.writevto(self.addr, (b"\x40", self._buffer_mv[page0 * width:(page1 + 1) * width]))
 
 # OLED Power Setup
 VEXT_CTRL = Pin(VEXT_CTRL_PIN, Pin.OUT)
@@ -38,11 +140,11 @@ RST_OLED.on()
 time.sleep(0.1)
 
 # Initialize I2C and OLED display with retries
-i2c = SoftI2C(scl=Pin(I2C_SCL_PIN), sda=Pin(I2C_SDA_PIN))
+i2c = I2C(I2C_ID, scl=Pin(I2C_SCL_PIN), sda=Pin(I2C_SDA_PIN), freq=I2C_FREQ)
 display = None
 for attempt in range(5):
     try:
-        display = ssd1306.SSD1306_I2C(OLED_WIDTH, OLED_HEIGHT, i2c)
+        display = PartialSSD1306(OLED_WIDTH, OLED_HEIGHT, i2c)
         print_debug("OLED display initialized successfully.")
         break  # Exit loop if initialization succeeds
     except OSError:
@@ -52,6 +154,17 @@ for attempt in range(5):
 if display is None:
     raise RuntimeError("Failed to initialize OLED display after multiple attempts.")
 
+# Heart blink requests: update_display stores the sender and sets the event, heart_worker blinks it
+heart_event = asyncio.Event()
+_heart_sender_id = None
+
+# Long-lived task that blinks the heart each time heart_event is set (start it once from main)
+async def heart_worker():
+    while True:
+        await heart_event.wait()
+        heart_event.clear()
+        await blink_heart(_heart_sender_id)
+
 # Function to blink the heart next to the last sender's device ID
 async def blink_heart(last_sender_id):
     if last_sender_id is None:
@@ -62,49 +175,62 @@ async def blink_heart(last_sender_id):
 
     # Horizontal position is fixed for all devices
     heart_x_offset = 15  # Just to the right of the second column
-    heart_width = 8
-    heart_height = 8
 
     # Blink the heart at the calculated position
     for _ in range(BLINK_COUNT):
-        # Draw the heart shape
-        for y in range(heart_height):
-            for x in range(heart_width):
-                if heart_matrix[y][x] == 1:
-                    display.pixel(heart_x_offset + x, heart_y_offset + y, 1)
-        display.show()
+        # Draw the heart shape (key 0: unset heart pixels leave the screen untouched)
+        display.blit(HEART_FB, heart_x_offset, heart_y_offset, 0)
+        display.mark_dirty(heart_x_offset, heart_y_offset, HEART_SIZE, HEART_SIZE)
+        display.fast_show()
         await asyncio.sleep(BLINK_INTERVAL_MS / 1000)
 
         # Clear the heart shape
-        for y in range(heart_height):
-            for x in range(heart_width):
-                display.pixel(heart_x_offset + x, heart_y_offset + y, 0)
-        display.show()
+        display.fill_rect(heart_x_offset, heart_y_offset, HEART_SIZE, HEART_SIZE, 0)
+        display.fast_show()
         await asyncio.sleep(BLINK_INTERVAL_MS / 1000)
 
 
+# Placeholder for a missing device line and the fixed Column 1 labels
+_EMPTY_LINE = ("", "", "", "", "", 0)
+
+# Per device row: (Column 1 label, row band top incl. highlight border, text baseline y)
+_ROW_LAYOUT = tuple((str(i + 1), 12 + i * LINE_SPACING, 14 + i * LINE_SPACING) for i in range(3))
+
+# Column x positions
+COL_1_X = const(0)
+COL_2_X = const(30)
+COL_3_X = const(90)
+
+# What is currently drawn in each screen region, so update_display only redraws what changed
+_drawn_header = None
+_drawn_rows = [None, None, None]
+_drawn_active = None
+_drawn_bar = None
+
 # Main function in charge of updating the display content dynamically based on the provided display_data
 async def update_display(display_data):
-    shared_info = display_data.get("header", "") + "  " + display_data.get("battery_level", "") + "%"
+    global _drawn_header, _drawn_active, _drawn_bar, _heart_sender_id
 
-    line_1_data = display_data.get(1, ["", "", "", "", "", ""])
-    line_2_data = display_data.get(2, ["", "", "", "", "", ""])
-    line_3_data = display_data.get(3, ["", "", "", "", "", ""])
+    get = display_data.get  # Bound once, used for every lookup below
 
-    line_data = [line_1_data, line_2_data, line_3_data]
+    shared_info = get("header_str")  # Prebuilt whenever the battery level changes
+    if shared_info is None:
+        shared_info = get("header", "") + "  " + get("battery_level", "") + "%"
 
-    display.fill(0)  # Clear display
+    line_data = (get(1, _EMPTY_LINE), get(2, _EMPTY_LINE), get(3, _EMPTY_LINE))
+
+    active_device = get("active_device", 1)  # Get active device (1-based index)
+    active_changed = active_device != _drawn_active
+    header_changed = shared_info != _drawn_header
+
+    # Local rebinds of the drawing methods used in the loop
+    text = display.text
+    fill_rect = display.fill_rect
 
     # Drawing the device lines
     for i, data in enumerate(line_data):
-        y_offset = 14 + i * LINE_SPACING
-
-        device_id = str(i + 1)  # Column 1: Device ID
-        signal = data[0]  # Signal
-        status = data[2]  # Status
-        health = data[3]  # Health status (HOT/COLD)
-        last_connection = data[4]  # Last connection time
-        button_time = data[5] if isinstance(data[5], int) else 0  # get the button time, or 0 if not a digit.
+        device_id, band_y, y_offset = _ROW_LAYOUT[i]  # Column 1: Device ID, row position
+        signal, _, status, health, last_connection, button_time = data  # Signal, SNR, Status, Health (HOT/COLD), Last connection time, Button time
 
         # Determine Column 2 content (Signal, LOST, REC)
         if button_time == 9 and status != "Wait":  # override the status, if button time is 0 and status is not wait.
@@ -121,44 +247,61 @@ async def update_display(display_data):
             column_2_content = signal  # Default to Signal
 
         # Determine Column 3 content (Last Connection or Health)
-        if health in ["HOT", "COLD"]:
+        if health == "HOT" or health == "COLD":
             column_3_content = health  # Show health status if present
         elif status == "Wait":
             column_3_content = ""
         else:
             column_3_content = last_connection  # Otherwise, show last connection
 
-        # Draw the text at calculated positions
-        display.text(device_id, 0, y_offset)  # Column 1
-        display.text(column_2_content, 30, y_offset)  # Column 2
-        display.text(column_3_content, 90, y_offset)  # Column 3
+        # Skip the row if neither its text nor its highlight changed
+        row = (column_2_content, column_3_content)
+        is_active = i + 1 == active_device
+        if row == _drawn_rows[i] and not (active_changed and (is_active or i + 1 == _drawn_active)):
+            continue
+        _drawn_rows[i] = row
 
-    # Display shared header info
-    display.fill_rect(0, 0, OLED_WIDTH, 12, 0)  # Clear header area
-    display.text(shared_info, 0, 2)  # Show header info
-    display.hline(0, 12, OLED_WIDTH, 1)  # Draw a line under the header
+        # Clear the row band (including its highlight border) and draw the text at calculated positions
+        fill_rect(0, band_y, OLED_WIDTH, LINE_HEIGHT, 0)
+        text(device_id, COL_1_X, y_offset)  # Column 1
+        text(column_2_content, COL_2_X, y_offset)  # Column 2
+        text(column_3_content, COL_3_X, y_offset)  # Column 3
 
-    # Draw the border around the active row (entire width)
-    active_device = display_data.get("active_device", 1)  # Get active device (1-based index)
-    highlight_y = 12 + (active_device - 1) * LINE_SPACING  # Calculate Y-position for the highlighted row
-    display.rect(0, highlight_y, OLED_WIDTH - 1, LINE_HEIGHT, 1)
+        # Draw the border around the active row (entire width)
+        if is_active:
+            display.rect(0, band_y, OLED_WIDTH - 1, LINE_HEIGHT, 1)
+
+        if i == 0:
+            header_changed = True  # The first band shares y=12 with the header line
+
+    # Display shared header info
+    if header_changed:
+        display.fill_rect(0, 0, OLED_WIDTH, 12, 0)  # Clear header area
+        display.text(shared_info, 0, 2)  # Show header info
+        display.hline(0, 12, OLED_WIDTH, 1)  # Draw a line under the header
+        _drawn_header = shared_info
+    _drawn_active = active_device
 
-    # Create a task to run blink_heart in the background
-    last_sender_id = display_data.get('last_sender_id', None)
+    # Hand the sender to heart_worker, which blinks the heart in the background
+    last_sender_id = get('last_sender_id', None)
     if last_sender_id is not None:
-        asyncio.create_task(blink_heart(last_sender_id))  # This runs blink_heart without blocking
+        _heart_sender_id = last_sender_id
+        heart_event.set()  # A blink already in progress picks this up when it finishes
 
     display_data['last_sender_id'] = None
 
     # Get the button time of the active device
     active_device_data = line_data[active_device - 1]  # Get data for the active device
-    button_time = active_device_data[5] if isinstance(active_device_data[5], int) else 0  # Get button time for active device
+    button_time = active_device_data[5]  # Get button time for active device (always an int)
 
     # Draw the progress if requested
     bar_width = min(button_time * (OLED_WIDTH // 2), OLED_WIDTH)  # Ensure the bar doesn't exceed display width
-    if bar_width > 0:
+    if bar_width != _drawn_bar:
         bar_height = 10
         progress_bar_y_offset = OLED_HEIGHT - bar_height  # Ensures full bar fits on screen
-        display.fill_rect(0, progress_bar_y_offset, bar_width, bar_height, 1)
+        display.fill_rect(0, progress_bar_y_offset, OLED_WIDTH, bar_height, 0)
+        if bar_width > 0:
+            display.fill_rect(0, progress_bar_y_offset, bar_width, bar_height, 1)
+        _drawn_bar = bar_width
 
-    display.show()
+    display.fast_show()
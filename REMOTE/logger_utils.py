@@ -1,23 +1,25 @@
 # logger_utils.py
 import config
 
+# Colored icon prefixes and the reset sequence, joined with the message into a single print()
+_INFO = "\033[37mℹ️ "       # White info icon start
+_WARNING = "\033[33m⚠️ "    # Yellow warning icon start
+_ERROR = "\033[31m❌ "      # Red error icon start
+_DEBUG = "\033[36m🐞 "      # Cyan debug icon start
+_RESET = "\033[0m"
+
 def print_info(*args, sep=' ', end='\n'):
-    print("\033[37mℹ️ ", end='')       # White info icon start
-    print(*args, sep=sep, end='')
-    print("\033[0m", end=end)
+    print(_INFO + sep.join(map(str, args)) + _RESET, end=end)
 
 def print_warning(*args, sep=' ', end='\n'):
-    print("\033[33m⚠️ ", end='')       # Yellow warning icon start
-    print(*args, sep=sep, end='')
-    print("\033[0m", end=end)
+    print(_WARNING + sep.join(map(str, args)) + _RESET, end=end)
 
 def print_error(*args, sep=' ', end='\n'):
-    print("\033[31m❌ ", end='')       # Red error icon start
-    print(*args, sep=sep, end='')
-    print("\033[0m", end=end)
+    print(_ERROR + sep.join(map(str, args)) + _RESET, end=end)
 
-def print_debug(*args, sep=' ', end='\n'):
-    if config.DEBUG_ENABLED:
-        print("\033[36m🐞 ", end='')   # Cyan debug icon start
-        print(*args, sep=sep, end='')
-        print("\033[0m", end=end)
\ No newline at end of file
+if config.DEBUG_ENABLED:
+    def print_debug(*args, sep=' ', end='\n'):
+        print(_DEBUG + sep.join(map(str, args)) + _RESET, end=end)
+else:
+    def print_debug(*args, sep=' ', end='\n'):
+        pass  # Debug disabled at import: calls are a no-op
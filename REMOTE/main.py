@@ -2,29 +2,42 @@
 import uasyncio as asyncio
 import machine
 import utime as time
+import struct
+from collections import deque
 from lora_controller import get_async_modem, send_coro, recv_coro
-from display_controller import update_display
-from battery import battery_percentage
-from config import DEVICE_UID, HEARTBEAT_TIMEOUT_SEC
+from display_controller import update_display, heart_worker
+from battery import battery_percentage_async
+from config import DEVICE_UID, HEARTBEAT_TIMEOUT_SEC, DEBUG_ENABLED
 from logger_utils import print_info, print_warning, print_error, print_debug
+from micropython import const
 
 # Global variables
 modem = None
 
 # Timeout constants
-BATT_CHECK_TIMEOUT_SEC = 60  # How often the battery level is checked
-AUTO_SLEEP_TIMEOUT_SEC = 300  # Sleep timeout
+BATT_CHECK_TIMEOUT_SEC = const(60)  # How often the battery level is checked
+AUTO_SLEEP_TIMEOUT_SEC = const(300)  # Sleep timeout
+BUTTON_DEBOUNCE_MS = const(20)  # Settle time after a button edge before reading the pin
+
+# Same timeouts in ms, compared against time.ticks_diff() of time.ticks_ms() stamps
+BATT_CHECK_TIMEOUT_MS = const(BATT_CHECK_TIMEOUT_SEC * 1000)
+AUTO_SLEEP_TIMEOUT_MS = const(AUTO_SLEEP_TIMEOUT_SEC * 1000)
+HEARTBEAT_TIMEOUT_MS = HEARTBEAT_TIMEOUT_SEC * 1000
 
 # LoRa Commands
-LORA_COMMANDS = {
-    "START": 0x01,
-    "STOP": 0x02,
-    "TRIGGER": 0x03,
-}
+_CMD_START = const(0x01)
+_CMD_STOP = const(0x02)
+_CMD_TRIGGER = const(0x03)
+_TRIGGER_PAYLOAD = bytes([_CMD_TRIGGER])  # Single-byte TRIGGER command payload, built once
+
+# Heartbeat labels, indexed by (sleep_mode == 0) * 2 + (recording == 1)
+# and (overheating == 1) * 2 + (low_temperature == 1) respectively
+_STATUS_OPTIONS = ("Stby", "REC", "SLEEP", "SLEEP")
+_HEALTH_OPTIONS = ("None", "COLD", "HOT", "HOT")
 
 # Initialize timoeut variables
-last_interaction_time = time.time()
-last_battery_check_time = time.time() - BATT_CHECK_TIMEOUT_SEC  # Trick it to be a past time
+last_interaction_time = time.ticks_ms()
+last_battery_check_time = time.ticks_add(time.ticks_ms(), -BATT_CHECK_TIMEOUT_MS)  # Trick it to be a past time
 
 # Initialize display message dictionary
 display_data = {
@@ -32,12 +45,16 @@ display_data = {
     'last_sender_id': None,
     'header': 'L.A.U.R.A.',  # Main header
     'battery_level': '00',  # Separate battery level
+    'header_str': 'L.A.U.R.A.  00%',  # Header line as drawn: header + battery level, rebuilt by check_battery
     
-    1: ['Signal', 'SNR', 'Status', 'Health', 'Last Comm', 'Button Press Time'],
-    2: ['Signal', 'SNR', 'Status', 'Health', 'Last Comm', 'Button Press Time'],
-    3: ['Signal', 'SNR', 'Status', 'Health', 'Last Comm', 'Button Press Time'],
+    1: ['Signal', 'SNR', 'Status', 'Health', 'Last Comm', 0],  # Button Press Time is always an int
+    2: ['Signal', 'SNR', 'Status', 'Health', 'Last Comm', 0],  # Button Press Time is always an int
+    3: ['Signal', 'SNR', 'Status', 'Health', 'Last Comm', 0],  # Button Press Time is always an int
 }
 
+# Set whenever display_data changes so refresh_display redraws right away instead of on its next tick
+refresh_event = asyncio.Event()
+
 # Initialize hearbeat data dictionary
 heartbeat_data = {
     1: {'last_heartbeat_time': None, 'heartbeat_timed_out': False},
@@ -45,24 +62,14 @@ heartbeat_data = {
     3: {'last_heartbeat_time': None, 'heartbeat_timed_out': False}
 }
 
-# Initialize hearbeat message dictionary
-heartbeat_message = {
-    "camera_connected": 0,
-    "battery_level": 0,
-    "sleep_mode": 0,
-    "overheating": 0,
-    "low_temperature": 0,
-    "flatmode": 0,
-    "preset_group": 0,
-    "video_preset": 0,
-    "framerate": 0,
-    "resolution": 0,
-    "recording": 0
-}
+# Last unpacked heartbeat per device, indexed by sender ID (index 0 unused):
+# (camera_connected, battery_level, sleep_mode, overheating, low_temperature, flatmode,
+#  preset_group, video_preset, framerate, resolution, recording)
+heartbeat_messages = [None, None, None, None]
 
 # Callback function to handle received messages
 def process_received_message(received_data):
-    global heartbeat_message, display_data, heartbeat_data
+    global display_data, heartbeat_data
     
     sender_id = received_data["sender_id"]
     rx = received_data["payload"]
@@ -73,170 +80,182 @@ def process_received_message(received_data):
     print_debug(f"Received a message from Device ID: {sender_id}")
                        
     if rx[0] == 0x10:  # Heartbeat message
-        data = rx[1:]
-        if len(data) == 11:
-            print_debug(f"Heartbeat data received: {data.hex()}")
+        if len(rx) == 12:  # Type byte + 11 heartbeat fields
+            if DEBUG_ENABLED:
+                print_debug(f"Heartbeat data received: {bytes(rx[1:]).hex()}")
             
             # Update the last heartbeat time for the corresponding camera
-            heartbeat_data[sender_id]['last_heartbeat_time'] = time.time()  # Set last heartbeat time
+            heartbeat_time = time.ticks_ms()
+            heartbeat_data[sender_id]['last_heartbeat_time'] = heartbeat_time  # Set last heartbeat time
             heartbeat_data[sender_id]['heartbeat_timed_out'] = False  # Reset timeout state
+            heartbeat_deadlines.append((heartbeat_time, sender_id))  # Schedule its timeout check
+            heartbeat_deadline_event.set()
             
-            # Update heartbeat_message dictionary
-            heartbeat_message.update({
-                "camera_connected": data[0],
-                "battery_level": data[1],
-                "sleep_mode": data[2],
-                "overheating": data[3],
-                "low_temperature": data[4],
-                "flatmode": data[5],
-                "preset_group": data[6],
-                "video_preset": data[7],
-                "framerate": data[8],
-                "resolution": data[9],
-                "recording": data[10]
-            })
+            # Unpack the heartbeat fields straight from the payload view and keep them per device
+            message = struct.unpack_from('11B', rx, 1)
+            heartbeat_messages[sender_id] = message
+            cam_on, batt, sleep_mode, hot, cold, flat, pg, vp, fr, res, rec = message
 
             # Update only specific indexes
             display_data[sender_id][0] = f"{rssi}dB"  # Signal strength
             display_data[sender_id][1] = f"{snr}dB"   # SNR
-            display_data[sender_id][2] = "SLEEP" if heartbeat_message['sleep_mode'] == 0 else ("REC" if heartbeat_message['recording'] == 1 else "Stby")  # Status
-            display_data[sender_id][3] = "HOT" if heartbeat_message['overheating'] == 1 else ("COLD" if heartbeat_message['low_temperature'] == 1 else "None")  # Health Alert
+            display_data[sender_id][2] = _STATUS_OPTIONS[(sleep_mode == 0) * 2 + (rec == 1)]  # Status
+            display_data[sender_id][3] = _HEALTH_OPTIONS[(hot == 1) * 2 + (cold == 1)]  # Health Alert
             display_data[sender_id][4] = ""  # Last communication time
             display_data[sender_id][5] = 0  # Clear the "SENT" state on heartbeat
 
             # Set the last sender ID
             print_debug(f"Updating display data for Device {sender_id}: {display_data}")
             display_data["last_sender_id"] = sender_id  # Store which device sent the last update
+            refresh_event.set()
 
             print_info(
                 f"[Heartbeat] "
-                f"{'😴' if data[2] == 0 else '✅'} CAMERA {sender_id}: {'Off' if data[0] == 0 else 'On'} | "
+                f"{'😴' if sleep_mode == 0 else '✅'} CAMERA {sender_id}: {'Off' if cam_on == 0 else 'On'} | "
                 f"📶 RSSI: {rssi}dB | "
                 f"📡 SNR: {snr}dB | "
-                f"{'🔥' if data[3] == 1 else '✅'} HOT: {'Yes' if data[3] == 1 else 'No'} | "
-                f"{'❄️' if data[4] == 1 else '✅'} COLD: {'Yes' if data[4] == 1 else 'No'} | "
-                f"{'🔴' if data[10] == 1 else '⚪'} RECORDING: {'Yes' if data[10] == 1 else 'No'}"
+                f"{'🔥' if hot == 1 else '✅'} HOT: {'Yes' if hot == 1 else 'No'} | "
+                f"{'❄️' if cold == 1 else '✅'} COLD: {'Yes' if cold == 1 else 'No'} | "
+                f"{'🔴' if rec == 1 else '⚪'} RECORDING: {'Yes' if rec == 1 else 'No'}"
             )
         else:
             print_warning("Heartbeat data corrupted therefore ignored")
 
-# Check for each device the last communication to generate the LOST label on the display
-def check_heartbeat_timeouts():
+# Pending heartbeat timeouts as (heartbeat ticks_ms, device_id). Every heartbeat appends one entry
+# and all share the same timeout, so the queue is already ordered by deadline; entries superseded
+# by a newer heartbeat from the same device are skipped when they come up
+heartbeat_deadlines = deque((), 32)
+heartbeat_deadline_event = asyncio.Event()  # Set when a heartbeat is queued
+
+# Wait for the next heartbeat deadline and generate the LOST label for the device if it passed
+async def heartbeat_timeout_watcher():
     global heartbeat_data
     
-    current_time = time.time()
-
-    for device_id in [1, 2, 3]:
-        last_heartbeat_time = heartbeat_data.get(device_id, {}).get('last_heartbeat_time')
-        heartbeat_timed_out = heartbeat_data.get(device_id, {}).get('heartbeat_timed_out', False)
-
-        if last_heartbeat_time is None:
-            heartbeat_timed_out = True
-        else:
-            time_since_last = current_time - last_heartbeat_time
-
-            if time_since_last > HEARTBEAT_TIMEOUT_SEC:
-                heartbeat_timed_out = True
-                print_warning(f"Camera {device_id} heartbeat timeout. Last comm {time_since_last}s ago.")
-            else:
-                heartbeat_timed_out = False
-
-        heartbeat_data[device_id] = {
-            'last_heartbeat_time': last_heartbeat_time,
-            'heartbeat_timed_out': heartbeat_timed_out
-        }
+    while True:
+        while not heartbeat_deadlines:
+            heartbeat_deadline_event.clear()
+            await heartbeat_deadline_event.wait()
+
+        heartbeat_time, device_id = heartbeat_deadlines.popleft()
+        wait_ms = time.ticks_diff(time.ticks_add(heartbeat_time, HEARTBEAT_TIMEOUT_MS), time.ticks_ms())
+        if wait_ms > 0:
+            await asyncio.sleep_ms(wait_ms)
+
+        device_heartbeat = heartbeat_data[device_id]
+        if device_heartbeat['last_heartbeat_time'] != heartbeat_time:
+            continue  # A newer heartbeat arrived, its own entry is further down the queue
+
+        device_heartbeat['heartbeat_timed_out'] = True
+        refresh_event.set()
+        time_since_last = time.ticks_diff(time.ticks_ms(), heartbeat_time)
+        print_warning(f"Camera {device_id} heartbeat timeout. Last comm {time_since_last // 1000}s ago.")
+
+# Last (timed out, last heartbeat time, seconds since) applied to each device line by refresh_display
+_prev_state = {}
+
+# Update one device's display line in place from its heartbeat data
+def _update_device_line(device_id, current_time):
+    # Get current heartbeat data for the device
+    device_heartbeat = heartbeat_data[device_id]
+    heartbeat_timed_out = device_heartbeat['heartbeat_timed_out']
+    last_heartbeat_time = device_heartbeat['last_heartbeat_time']
+    last_comm_time = None if last_heartbeat_time is None else time.ticks_diff(current_time, last_heartbeat_time) // 1000
+
+    # Skip the device if nothing shown on its line has changed since the last refresh
+    state = (heartbeat_timed_out, last_heartbeat_time, last_comm_time)
+    if _prev_state.get(device_id) == state:
+        return
+    _prev_state[device_id] = state
+
+    # Signal, SNR, Status, Health, Last Comm, Button Held Seconds (kept as is)
+    line = display_data[device_id]
+
+    # If heartbeat data is None, it means the device never communicated, display 'Wait'
+    if last_heartbeat_time is None:
+        line[0] = line[1] = line[3] = line[4] = ""
+        line[2] = "Wait"						# Status - Device has not communicated yet
+        return
+
+    # If heartbeat is timed out, display "Lost" and show the last communication time
+    if heartbeat_timed_out and line[2] != "LOST":
+        line[0] = line[1] = line[3] = ""
+        line[2] = "LOST"						# Status
+
+    # Last Comm - Time since last communication in seconds (other fields keep the last heartbeat's values)
+    line[4] = f"{last_comm_time}s"
 
 #  Monitor and refresh display
 async def refresh_display():
     global display_data, heartbeat_data, last_battery_check_time
 
     while True:
-        # Check the communication timeouts
-        check_heartbeat_timeouts()
-        
-        # Loop through all devices (1, 2, 3) and update their data for the display
-        for device_id in [1, 2, 3]:
-            
-            # Get current heartbeat data for the device
-            heartbeat_timed_out = heartbeat_data.get(device_id, {}).get('heartbeat_timed_out', False)
-            last_heartbeat_time = heartbeat_data.get(device_id, {}).get('last_heartbeat_time', None)
-
-            # If heartbeat data is None, it means the device never communicated, display 'Wait'
-            if last_heartbeat_time is None:
-                display_data[device_id] = [
-                    "",							# Signal strength
-                    "",							# SNR value
-                    "Wait",						# Status - Device has not communicated yet
-                    "",							# Health
-                    "",							# Last Comm
-                    display_data[device_id][5] if device_id in display_data and len(display_data[device_id])>5 else "" # Button Held Seconds
-                ]
-            
-            # If heartbeat is timed out, display "Lost" and show the last communication time
-            elif heartbeat_timed_out:
-                last_comm_time = time.time() - last_heartbeat_time
-                display_data[device_id] = [
-                    "",							# Signal strength
-                    "",							# SNR value
-                    "LOST",						# Status
-                    "",							# Health
-                    f"{last_comm_time:.0f}s",	# Last Comm - Time since last communication in seconds
-                    display_data[device_id][5] if device_id in display_data and len(display_data[device_id])>5 else "" # Button Held Seconds
-                ]
-            
-            # If heartbeat data is available, use the last heartbeat time to update
-            else:
-                last_comm_time = time.time() - last_heartbeat_time
-
-                # Access device data from the display_data structure
-                signal_strength = display_data.get(device_id, [])[0]  # Signal (Index 0)
-                snr_value = display_data.get(device_id, [])[1]  # SNR (Index 1)
-                status_value = display_data.get(device_id, [])[2]  # SNR (Index 2)
-                health_value = display_data.get(device_id, [])[3]  # SNR (Index 3)
-
-                # Update the display data for the device
-                display_data[device_id] = [
-                    signal_strength,			# Signal strength
-                    snr_value,					# SNR value
-                    status_value,				# Status
-                    health_value,				# Health
-                    f"{last_comm_time:.0f}s",	# Last Comm (time since last heartbeat)
-                    display_data[device_id][5] if device_id in display_data and len(display_data[device_id])>5 else "" # Button Held Seconds
-                ]
+        # Update the data of the three devices for the display in place
+        current_time = time.ticks_ms()
+        _update_device_line(1, current_time)
+        _update_device_line(2, current_time)
+        _update_device_line(3, current_time)
         
         # Call the batery check at each display refresh
-        check_battery()
+        await check_battery()
         
         try:
             await update_display(display_data)  # Update the display with the latest data
         except Exception as e:
             print_error(f"update_display() failed: {e}")
 
-        await asyncio.sleep(1)  # Adjust as needed
+        # Wake as soon as new data arrives, or after 1 s to tick the Last Comm counters
+        try:
+            await asyncio.wait_for(refresh_event.wait(), 1)
+        except asyncio.TimeoutError:
+            pass
+        refresh_event.clear()
         
-def check_battery():
+async def check_battery():
     global last_battery_check_time, display_data
 
-    current_time = time.time()
-    if current_time - last_battery_check_time >= BATT_CHECK_TIMEOUT_SEC:
-        battery_level = battery_percentage()
+    current_time = time.ticks_ms()
+    if time.ticks_diff(current_time, last_battery_check_time) >= BATT_CHECK_TIMEOUT_MS:
+        battery_level = await battery_percentage_async()
         print_debug(f"Current battery level: {battery_level}%")
         display_data['battery_level'] = f"{battery_level}"
+        display_data['header_str'] = display_data['header'] + "  " + display_data['battery_level'] + "%"
         last_battery_check_time = current_time  # Update timestamp
 
 # Monitor the button press to switch active device or send trigger
+# The pin IRQ wakes the coroutine on each edge; while held it also wakes once per second to count
 async def monitor_button(pin, modem, DEVICE_UID):
     global display_data, last_interaction_time
     button = machine.Pin(pin, machine.Pin.IN, machine.Pin.PULL_UP)
-    trigger_sent = False  # Flag to track if trigger has been sent
-    seconds_held = 0  # Track seconds elapsed
-    press_start_time = None  # To track when the button was pressed
+    edge = asyncio.ThreadSafeFlag()  # Set from the IRQ on every press or release edge
+    button.irq(trigger=machine.Pin.IRQ_FALLING | machine.Pin.IRQ_RISING, handler=lambda p: edge.set())
 
     while True:
-        if button.value() == 0:  # Button pressed (pin is LOW)
-            if press_start_time is None:  # Check if this is the start of the press
-                press_start_time = time.ticks_ms()  # Record press start time
-                seconds_held = 0  # Reset seconds held at the beginning of a new press
+        # Wait for a press (pin goes LOW), ignoring bounces and releases
+        await edge.wait()
+        await asyncio.sleep_ms(BUTTON_DEBOUNCE_MS)
+        if button.value():
+            continue
+
+        press_start_time = time.ticks_ms()  # Record press start time
+        trigger_sent = False  # Flag to track if trigger has been sent
+        seconds_held = 0  # Track seconds elapsed
+
+        while True:
+            if trigger_sent:
+                await edge.wait()  # Nothing left to count, just wait for the release
+                await asyncio.sleep_ms(BUTTON_DEBOUNCE_MS)
+            else:
+                # Sleep until the next full second held, or until an edge arrives first
+                remaining = (seconds_held + 1) * 1000 - time.ticks_diff(time.ticks_ms(), press_start_time)
+                if remaining > 0:
+                    try:
+                        await asyncio.wait_for(edge.wait(), remaining / 1000)
+                        await asyncio.sleep_ms(BUTTON_DEBOUNCE_MS)
+                    except asyncio.TimeoutError:
+                        pass
+
+            if button.value():
+                break  # Button released (pin is HIGH)
 
             press_duration = time.ticks_diff(time.ticks_ms(), press_start_time)  # Time held
 
@@ -248,46 +267,38 @@ async def monitor_button(pin, modem, DEVICE_UID):
                 # Update the Button Press Time for the active device
                 active_device = display_data["active_device"]
                 display_data[active_device][5] = seconds_held  # Store seconds_held in 6th position
+                refresh_event.set()
 
                 # If held for 2+ seconds, send trigger (only if not already sent)
                 if seconds_held == 2:
                     print_info("Button pressed for more than 2 seconds, sending trigger command...")
-                    payload = bytes([LORA_COMMANDS["TRIGGER"]])
-                    asyncio.create_task(send_coro(modem, DEVICE_UID, active_device, payload))
+                    asyncio.create_task(send_coro(modem, DEVICE_UID, active_device, _TRIGGER_PAYLOAD))
                     display_data[active_device][5] = 9  # Store 9 in 6th position after trigger ti call the SENT label for the selected Device
                     trigger_sent = True  # Mark the trigger as sent to avoid multiple sent until button release
                     print_debug(f"Sent trigger command to Device {active_device}")
 
-            await asyncio.sleep(0.1)  # Prevent busy waiting
-
-        else:  # Button released (pin is HIGH)
-            if press_start_time is not None:  # If the button was pressed previously
-                # Short press (<3 sec) switches active device
-                if seconds_held < 3 and not trigger_sent:
-                    print_debug("Button pressed, switching Device")
-                    active_device = display_data["active_device"]
-                    display_data["active_device"] = (active_device % 3) + 1
-                    print_info(f"Switched to Device {display_data['active_device']}")
+        # Short press (<3 sec) switches active device
+        if seconds_held < 3 and not trigger_sent:
+            print_debug("Button pressed, switching Device")
+            active_device = display_data["active_device"]
+            display_data["active_device"] = (active_device % 3) + 1
+            print_info(f"Switched to Device {display_data['active_device']}")
 
-                # Reset trigger flag and counter after button release
-                trigger_sent = False  # Reset the trigger flag to allow future triggers
-                press_start_time = None  # Reset press start time for next press
-                seconds_held = 0  # Reset the hold time counter
-                display_data[display_data["active_device"]][5] = 0  # Reset the button hold counter
+        # Reset the button hold counter after button release
+        display_data[display_data["active_device"]][5] = 0
+        refresh_event.set()
 
-                last_interaction_time = time.time()  # Update last interaction time
-
-        await asyncio.sleep(0.1)  # Small debounce delay
+        last_interaction_time = time.ticks_ms()  # Update last interaction time
     
 async def monitor_inactivity():
     global last_interaction_time
     while True:
-        current_time = time.time()
-        inactivity_duration = current_time - last_interaction_time
+        inactivity_duration = time.ticks_diff(time.ticks_ms(), last_interaction_time)
 
-        print_debug(f"Power save check: {inactivity_duration}s since last interaction")
+        if DEBUG_ENABLED:
+            print_debug(f"Power save check: {inactivity_duration // 1000}s since last interaction")
 
-        if inactivity_duration > AUTO_SLEEP_TIMEOUT_SEC:
+        if inactivity_duration > AUTO_SLEEP_TIMEOUT_MS:
             print_info(f"No interaction for more that {AUTO_SLEEP_TIMEOUT_SEC}s: entering sleep mode")
             machine.deepsleep()
 
@@ -299,10 +310,14 @@ async def main():
     
     print_debug("Initializing display with default values...")
     asyncio.create_task(refresh_display())  
+    asyncio.create_task(heart_worker())
 
     print_info("Initializing modem...")
     modem = get_async_modem()
 
+    print_info("Starting heartbeat timeout watcher...")
+    asyncio.create_task(heartbeat_timeout_watcher())
+
     print_info("Starting message reception...")
     asyncio.create_task(recv_coro(modem, DEVICE_UID, process_received_message))
     
@@ -312,5 +327,5 @@ async def main():
     print_info("Starting monitor for inactivity...")
     asyncio.create_task(monitor_inactivity())
 
-    while True:
-        await asyncio.sleep(1)
+    # Park the main task without a timer; the work runs in the tasks created above
+    await asyncio.Event().wait()